@@ -8,11 +8,16 @@ import logging
 class GmailConfig:
     credentials_path: str
     token_path: str
+    # 'full' fetches and decodes message bodies; 'snippet' uses Gmail's
+    # server-side ~100-char snippet and skips body transfer entirely
+    body_mode: str = 'full' 
 
 @dataclass  
 class OllamaConfig:
     url: str
     model: str
+    # Concurrent generations allowed when summarizing in parallel
+    max_parallel: int = 4
 
 @dataclass
 class EmailConfig:
@@ -59,7 +64,8 @@ class ConfigManager:
         # Gmail configuration
         gmail_config = GmailConfig(
             credentials_path=self._get_env('GMAIL_CREDENTIALS_PATH', '../credentials.json'),
-            token_path=self._get_env('GMAIL_TOKEN_PATH', '../token.json')
+            token_path=self._get_env('GMAIL_TOKEN_PATH', '../token.json'),
+            body_mode=self._get_env('GMAIL_BODY_MODE', 'full').lower()
         )
         
         # Ollama configuration
@@ -72,7 +78,8 @@ class ConfigManager:
         
         ollama_config = OllamaConfig(
             url=ollama_url,
-            model=ollama_model
+            model=ollama_model,
+            max_parallel=int(self._get_env('OLLAMA_MAX_PARALLEL', '4'))
         )
         
         # Email configuration
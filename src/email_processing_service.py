@@ -57,7 +57,8 @@ class EmailProcessingService:
             logging.info("🔐 Starting Gmail authentication process...")
             self.gmail_client = GmailClient(
                 credentials_path=self.config.gmail.credentials_path,
-                token_path=self.config.gmail.token_path
+                token_path=self.config.gmail.token_path,
+                body_mode=getattr(self.config.gmail, 'body_mode', 'full')
             )
             
             # Initialize Ollama client
@@ -293,8 +294,7 @@ class EmailProcessingService:
             # Generate summaries like CLI does
             progress_tracker.update_stage('generating', 80, 'Generating summaries...')
             
-            text_summary = self.email_processor.format_email_summary_text(result)
-            html_summary = self.email_processor.format_email_summary_html(result)
+            text_summary, html_summary = self.email_processor.format_all_summaries(result)
             
             # Generate voice summary if enabled
             voice_file_path = None
@@ -157,37 +157,46 @@ class EmailProcessor:
             return []
         
         email_summaries = []
-        
+
         print(f"\n🔄 Processing {category} Emails ({len(emails)} emails)")
-        
+        print(f"   🤖 Analyzing with {self.ollama_client.model} ({self.ollama_client.max_parallel} parallel requests)...")
+
+        # Fetch all summaries up front — the per-email loop below only
+        # renders results that are already in hand. Plain runs fold
+        # BATCH_SIZE emails per prompt (with chunks in flight in
+        # parallel); phishing runs use the fused per-email analysis,
+        # concurrently, so its phishing fields ride along.
+        if options.get('include_phishing', False):
+            summaries = self.ollama_client.summarize_emails_parallel(emails, combined=True)
+        else:
+            summaries = self.ollama_client.summarize_emails_batch(emails)
+
         # Create progress bar
         progress_bar = tqdm(
-            emails, 
-            desc=f"🤖 AI Processing {category}", 
+            zip(emails, summaries),
+            total=len(emails),
+            desc=f"🤖 AI Processing {category}",
             unit="email",
             bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} emails [{elapsed}<{remaining}, {rate_fmt}]'
         )
-        
-        for i, email_data in enumerate(progress_bar, 1):
+
+        for i, (email_data, summary) in enumerate(progress_bar, 1):
             try:
                 # Detailed email info
                 sender_short = email_data['sender'].split('@')[0][:20]
                 subject_short = email_data['subject'][:25] + "..." if len(email_data['subject']) > 25 else email_data['subject']
-                
+
                 # Update progress bar with current email details
                 progress_bar.set_description(f"🤖 {category} ({i}/{len(emails)})")
                 progress_bar.set_postfix_str(f"{sender_short}: '{subject_short}'")
-                
+
                 # Print detailed processing info
                 print(f"\n📧 Processing {category} Email {i}/{len(emails)}:")
                 print(f"   📤 From: {email_data['sender']}")
                 print(f"   📝 Subject: {email_data['subject']}")
                 print(f"   📅 Date: {email_data['date']}")
                 print(f"   📏 Content length: {len(email_data['body'])} characters")
-                print(f"   🤖 Sending to {self.ollama_client.model} for analysis...")
-                
-                summary = self.ollama_client.summarize_email(email_data)
-                
+
                 # Print AI analysis results
                 print(f"   ✅ AI Analysis Complete:")
                 print(f"      🏷️  Priority: {summary['priority']}")
@@ -204,7 +213,7 @@ class EmailProcessor:
                 if summary['requires_response']:
                     print(f"      ⚠️  Requires Response: YES")
                 
-                email_summaries.append({
+                summary_entry = {
                     'email_id': email_data['id'],
                     'sender': email_data['sender'],
                     'subject': email_data['subject'],
@@ -214,8 +223,14 @@ class EmailProcessor:
                     'priority': summary['priority'],
                     'requires_response': summary['requires_response'],
                     'category': category.lower()  # Add category to each email
-                })
-                
+                }
+                if 'phishing_score' in summary:
+                    # Carry the fused phishing fields so PhishingDetector
+                    # can reuse them instead of issuing its own LLM call
+                    summary_entry['phishing_score'] = summary['phishing_score']
+                    summary_entry['phishing_explanation'] = summary.get('phishing_explanation', '')
+                email_summaries.append(summary_entry)
+
                 # Update progress bar with completion status
                 progress_bar.set_postfix(status=f"✅ {summary['priority']}")
                 
@@ -281,10 +296,21 @@ class EmailProcessor:
         
         return commercial_emails, personal_emails
     
-    def format_email_summary_text(self, processing_result: Dict[str, Any]) -> str:
+    def format_all_summaries(self, processing_result: Dict[str, Any]) -> Tuple[str, str]:
+        """Build the text and HTML reports in one pass over the summaries.
+
+        Both reports group by priority and walk the same emails, so they
+        share one partition and one traversal instead of filtering the
+        summary list six times.
+        """
         email_summaries = processing_result['email_summaries']
-        
-        text = f"""
+
+        groups = {'High': [], 'Medium': [], 'Low': []}
+        for email in email_summaries:
+            if email['priority'] in groups:
+                groups[email['priority']].append(email)
+
+        text_parts = [f"""
 EMAIL SUMMARY REPORT
 Generated: {processing_result['processed_at']}
 Total Emails: {processing_result['total_emails']}
@@ -295,41 +321,9 @@ OVERALL SUMMARY:
 {processing_result['overall_summary']}
 
 INDIVIDUAL EMAIL SUMMARIES:
-"""
-        
-        # Group by priority
-        high_priority = [e for e in email_summaries if e['priority'] == 'High']
-        medium_priority = [e for e in email_summaries if e['priority'] == 'Medium']
-        low_priority = [e for e in email_summaries if e['priority'] == 'Low']
-        
-        for priority_group, title in [(high_priority, "HIGH PRIORITY"), 
-                                     (medium_priority, "MEDIUM PRIORITY"), 
-                                     (low_priority, "LOW PRIORITY")]:
-            if priority_group:
-                text += f"\n{title} EMAILS:\n"
-                text += "-" * (len(title) + 8) + "\n"
-                
-                for email in priority_group:
-                    text += f"\nFrom: {email['sender']}\n"
-                    text += f"Subject: {email['subject']}\n"
-                    text += f"Summary: {email['summary']}\n"
-                    
-                    if email['action_items']:
-                        text += f"Action Items:\n"
-                        for item in email['action_items']:
-                            text += f"  • {item}\n"
-                    
-                    if email['requires_response']:
-                        text += "⚠️ REQUIRES RESPONSE\n"
-                    
-                    text += "\n"
-        
-        return text
-    
-    def format_email_summary_html(self, processing_result: Dict[str, Any]) -> str:
-        email_summaries = processing_result['email_summaries']
-        
-        html = f"""
+"""]
+
+        html_parts = [f"""
         <html>
         <head>
             <style>
@@ -373,39 +367,52 @@ INDIVIDUAL EMAIL SUMMARIES:
             </div>
             
             <h2>📬 Individual Email Summaries</h2>
-        """
-        
-        # Group by priority
-        priority_groups = [
-            ([e for e in email_summaries if e['priority'] == 'High'], "🔴 High Priority", "priority-high"),
-            ([e for e in email_summaries if e['priority'] == 'Medium'], "🟡 Medium Priority", "priority-medium"),
-            ([e for e in email_summaries if e['priority'] == 'Low'], "🟢 Low Priority", "priority-low")
-        ]
-        
-        for emails, title, css_class in priority_groups:
-            if emails:
-                html += f"<h3>{title}</h3>"
-                
-                for email in emails:
-                    response_indicator = "⚠️ REQUIRES RESPONSE" if email['requires_response'] else ""
-                    
-                    html += f"""
+        """]
+
+        for priority, text_title, html_title, css_class in (
+                ('High', 'HIGH PRIORITY', '🔴 High Priority', 'priority-high'),
+                ('Medium', 'MEDIUM PRIORITY', '🟡 Medium Priority', 'priority-medium'),
+                ('Low', 'LOW PRIORITY', '🟢 Low Priority', 'priority-low')):
+            emails = groups[priority]
+            if not emails:
+                continue
+
+            text_parts.append(f"\n{text_title} EMAILS:\n")
+            text_parts.append("-" * (len(text_title) + 8) + "\n")
+            html_parts.append(f"<h3>{html_title}</h3>")
+
+            for email in emails:
+                text_parts.append(f"\nFrom: {email['sender']}\n")
+                text_parts.append(f"Subject: {email['subject']}\n")
+                text_parts.append(f"Summary: {email['summary']}\n")
+
+                html_parts.append(f"""
                     <div class="email-item {css_class}">
                         <h4>{email['subject']}</h4>
                         <p><strong>From:</strong> {email['sender']}</p>
                         <p><strong>Summary:</strong> {email['summary']}</p>
-                    """
-                    
-                    if email['action_items']:
-                        html += "<div class='action-items'><strong>Action Items:</strong><ul>"
-                        for item in email['action_items']:
-                            html += f"<li>{item}</li>"
-                        html += "</ul></div>"
-                    
-                    if email['requires_response']:
-                        html += f"<p class='requires-response'>{response_indicator}</p>"
-                    
-                    html += "</div>"
-        
-        html += "</body></html>"
-        return html
\ No newline at end of file
+                    """)
+
+                if email['action_items']:
+                    text_parts.append("Action Items:\n")
+                    html_parts.append("<div class='action-items'><strong>Action Items:</strong><ul>")
+                    for item in email['action_items']:
+                        text_parts.append(f"  • {item}\n")
+                        html_parts.append(f"<li>{item}</li>")
+                    html_parts.append("</ul></div>")
+
+                if email['requires_response']:
+                    text_parts.append("⚠️ REQUIRES RESPONSE\n")
+                    html_parts.append("<p class='requires-response'>⚠️ REQUIRES RESPONSE</p>")
+
+                text_parts.append("\n")
+                html_parts.append("</div>")
+
+        html_parts.append("</body></html>")
+        return ''.join(text_parts), ''.join(html_parts)
+
+    def format_email_summary_text(self, processing_result: Dict[str, Any]) -> str:
+        return self.format_all_summaries(processing_result)[0]
+
+    def format_email_summary_html(self, processing_result: Dict[str, Any]) -> str:
+        return self.format_all_summaries(processing_result)[1]
@@ -1,19 +1,209 @@
+import gzip
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any, Optional
 import json
 
+# orjson serializes/deserializes large nested dicts several times faster than
+# stdlib json and writes UTF-8 bytes directly; fall back silently when absent
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Static portion of the category HTML reports — contains no per-call values,
+# so it is built once instead of being re-formatted on every save
+_HTML_HEAD = """
+        <html>
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; line-height: 1.6; margin: 20px; }
+                .header { background-color: #f4f4f4; padding: 15px; border-radius: 5px; margin-bottom: 20px; }
+                .stats { display: flex; gap: 20px; margin-bottom: 20px; }
+                .stat { background-color: #e9e9e9; padding: 10px; border-radius: 5px; text-align: center; }
+                .priority-high { border-left: 5px solid #d32f2f; }
+                .priority-medium { border-left: 5px solid #f57c00; }
+                .priority-low { border-left: 5px solid #388e3c; }
+                .email-item { margin-bottom: 20px; padding: 15px; border: 1px solid #ddd; border-radius: 5px; }
+                .action-items { margin-top: 10px; }
+                .action-items ul { margin: 5px 0; }
+                .requires-response { color: #d32f2f; font-weight: bold; }
+            </style>
+        </head>
+        <body>"""
+
+
+def _json_default(obj: Any):
+    """Handle non-native values inside the encoder's own traversal.
+
+    Letting the C encoder call back for the occasional datetime/set/object
+    avoids pre-converting whole processing results into intermediate
+    JSON-safe dicts before every dump.
+    """
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    if hasattr(obj, '__dict__'):
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _encode_json(data: Any, pretty: bool = True) -> bytes:
+    """Encode data as UTF-8 JSON bytes, preferring orjson.
+
+    Machine-read files (the index) should pass pretty=False: compact output
+    halves the bytes written and, in the stdlib fallback, ensure_ascii=True
+    keeps the C encoder fast path enabled.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, option=option, default=_json_default)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False,
+                          default=_json_default).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=True,
+                      default=_json_default).encode('utf-8')
+
+
+def _dump_json(data: Any, path: str, pretty: bool = True):
+    """Write data as UTF-8 JSON, preferring orjson"""
+    # The payload is one pre-encoded bytes object; unbuffered mode makes the
+    # write a single syscall with no intermediate copy
+    with open(path, 'wb', buffering=0) as f:
+        f.write(_encode_json(data, pretty))
+
+
+def _fast_copy(src: str, dst: str):
+    """Copy a file using in-kernel paths when the platform supports them.
+
+    Tries os.copy_file_range (reflink/server-side copy on CoW and NFS
+    filesystems), then os.sendfile, then a 1MiB readinto loop — multi-MB
+    voice files never round-trip through a Python-level read/write loop
+    unless both kernel paths are unavailable.
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(src_fd).st_size
+
+        if hasattr(os, 'copy_file_range'):
+            try:
+                copied = 0
+                while copied < size:
+                    sent = os.copy_file_range(src_fd, dst_fd, size - copied)
+                    if sent == 0:
+                        break
+                    copied += sent
+                if copied >= size:
+                    return
+            except OSError:
+                fdst.seek(0)
+                fdst.truncate()
+
+        if hasattr(os, 'sendfile'):
+            try:
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                if offset >= size:
+                    return
+            except OSError:
+                fdst.seek(0)
+                fdst.truncate()
+                fsrc.seek(0)
+
+        buffer = bytearray(1 << 20)
+        view = memoryview(buffer)
+        while True:
+            read = fsrc.readinto(buffer)
+            if not read:
+                break
+            fdst.write(view[:read])
+
+
+class _BatchedWriter:
+    """Queue encoded file payloads and flush them together in one pass.
+
+    A summary save produces 3-7 small files. Funnelling them through one
+    flush keeps each file to a single open/write/close with no buffered
+    layers in between, and gives a single submission point where a batched
+    backend (e.g. io_uring) can be plugged in without touching callers.
+    """
+
+    def __init__(self):
+        self._pending = []
+
+    def add(self, path: str, content):
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        self._pending.append((path, content))
+
+    def flush(self):
+        # The payloads are independent files and write() releases the GIL,
+        # so a small pool genuinely overlaps the write stalls
+        if len(self._pending) > 1:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(self._write_one, self._pending))
+        else:
+            for item in self._pending:
+                self._write_one(item)
+        self._pending.clear()
+
+    @staticmethod
+    def _write_one(item):
+        path, data = item
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+
+def _load_json(path: str) -> Any:
+    """Read a JSON file, preferring orjson; transparently reads .gz archives"""
+    if not os.path.exists(path) and os.path.exists(path + '.gz'):
+        with gzip.open(path + '.gz', 'rb') as f:
+            raw = f.read()
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    with open(path, 'rb') as f:
+        raw = f.read()
+    # Both parsers take UTF-8 bytes directly, skipping the TextIOWrapper's
+    # chunked decode
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
 class FileSaver:
-    def __init__(self, output_dir: str = "summaries"):
+    # JSONL index tuning: lazily trim past 1MB, keep the last 100 entries,
+    # and tail-read at most 64KB when listing recent summaries
+    INDEX_COMPACT_BYTES = 1 << 20
+    INDEX_MAX_ENTRIES = 100
+    INDEX_TAIL_BYTES = 1 << 16
+
+    # With compact=True, summaries older than this many days are gzipped
+    # during cleanup instead of waiting for deletion
+    COMPACT_AFTER_DAYS = 7
+
+    def __init__(self, output_dir: str = "summaries", compact: bool = False):
         self.output_dir = output_dir
+        self.compact = compact
         self._ensure_output_dir()
+        # Cache index paths and existence so per-save updates skip the
+        # repeated os.path.join/os.path.exists stat traffic
+        self._index_path = os.path.join(self.output_dir, "index.jsonl")
+        self._legacy_index_path = os.path.join(self.output_dir, "index.json")
+        self._index_exists = os.path.exists(self._index_path)
     
     def _ensure_output_dir(self):
         """Create output directory if it doesn't exist"""
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
-            logging.info(f"Created output directory: {self.output_dir}")
+            logging.info("Created output directory: %s", self.output_dir)
     
     def save_summary(self, processing_result: Dict[str, Any], text_summary: str, html_summary: str, voice_file_path: Optional[str] = None) -> Dict[str, str]:
         """Save email summary to local files with categorization support"""
@@ -35,43 +225,43 @@ class FileSaver:
         saved_files = {}
         
         try:
-            # Save JSON data
-            json_path = os.path.join(self.output_dir, f"{base_filename}.json")
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(processing_result, f, indent=2, ensure_ascii=False)
+            # Queue JSON, text and HTML payloads and write them in one batch;
+            # the directory prefix is joined once for all sibling files
+            writer = _BatchedWriter()
+            prefix = os.path.join(self.output_dir, base_filename)
+
+            json_path = prefix + ".json"
+            writer.add(json_path, _encode_json(processing_result))
             saved_files['json'] = json_path
-            logging.info(f"Saved JSON summary: {json_path}")
-            
-            # Save text summary
-            text_path = os.path.join(self.output_dir, f"{base_filename}.txt")
-            with open(text_path, 'w', encoding='utf-8') as f:
-                f.write(text_summary)
+
+            text_path = prefix + ".txt"
+            writer.add(text_path, text_summary)
             saved_files['text'] = text_path
-            logging.info(f"Saved text summary: {text_path}")
-            
-            # Save HTML summary
-            html_path = os.path.join(self.output_dir, f"{base_filename}.html")
-            with open(html_path, 'w', encoding='utf-8') as f:
-                f.write(html_summary)
+
+            html_path = prefix + ".html"
+            writer.add(html_path, html_summary)
             saved_files['html'] = html_path
-            logging.info(f"Saved HTML summary: {html_path}")
+
+            writer.flush()
+            logging.info("Saved JSON summary: %s", json_path)
+            logging.info("Saved text summary: %s", text_path)
+            logging.info("Saved HTML summary: %s", html_path)
             
             # Copy voice file if provided
             if voice_file_path and os.path.exists(voice_file_path):
-                voice_dest = os.path.join(self.output_dir, f"{base_filename}_voice.mp3")
-                import shutil
-                shutil.copy2(voice_file_path, voice_dest)
+                voice_dest = prefix + "_voice.mp3"
+                _fast_copy(voice_file_path, voice_dest)
                 saved_files['voice'] = voice_dest
-                logging.info(f"Saved voice summary: {voice_dest}")
+                logging.info("Saved voice summary: %s", voice_dest)
             
             # Create summary index file
             self._update_index(base_filename, processing_result, saved_files)
             
-            logging.info(f"Email summary saved successfully with {len(saved_files)} files")
+            logging.info("Email summary saved successfully with %s files", len(saved_files))
             return saved_files
             
         except Exception as e:
-            logging.error(f"Failed to save summary files: {e}")
+            logging.error("Failed to save summary files: %s", e)
             return {}
     
     def _save_categorized_summary(self, processing_result: Dict[str, Any], text_summary: str, html_summary: str, voice_file_path: Optional[str], timestamp: str) -> Dict[str, str]:
@@ -80,95 +270,110 @@ class FileSaver:
         saved_files = {}
         
         try:
-            # Save main JSON data
-            json_path = os.path.join(self.output_dir, f"{base_filename}.json")
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(processing_result, f, indent=2, ensure_ascii=False)
+            # Queue every payload and write them in one batch at the end;
+            # the directory prefix is joined once for all sibling files
+            writer = _BatchedWriter()
+            prefix = os.path.join(self.output_dir, base_filename)
+
+            json_path = prefix + ".json"
+            writer.add(json_path, _encode_json(processing_result))
             saved_files['json'] = json_path
-            logging.info(f"Saved categorized JSON summary: {json_path}")
+            logging.info("Saved categorized JSON summary: %s", json_path)
             
             # Save unified text and HTML summaries (contains both categories)
-            text_path = os.path.join(self.output_dir, f"{base_filename}.txt")
-            with open(text_path, 'w', encoding='utf-8') as f:
-                f.write(text_summary)
+            text_path = prefix + ".txt"
+            writer.add(text_path, text_summary)
             saved_files['text'] = text_path
             
-            html_path = os.path.join(self.output_dir, f"{base_filename}.html")
-            with open(html_path, 'w', encoding='utf-8') as f:
-                f.write(html_summary)
+            html_path = prefix + ".html"
+            writer.add(html_path, html_summary)
             saved_files['html'] = html_path
             
-            # Create separate commercial and personal reports
+            # Create separate commercial and personal reports. Partition the
+            # summaries by category in one pass instead of re-filtering the
+            # full list for each category.
             commercial_emails = processing_result.get('commercial_emails', [])
             personal_emails = processing_result.get('personal_emails', [])
-            
+
+            summaries_by_category = {'commercial': [], 'personal': []}
+            for email in processing_result.get('email_summaries', []):
+                summaries_by_category.setdefault(
+                    email.get('category', '').lower(), []
+                ).append(email)
+
             if commercial_emails:
-                commercial_result = self._create_category_result(processing_result, commercial_emails, 'commercial')
+                commercial_result = self._create_category_result(
+                    processing_result, commercial_emails,
+                    summaries_by_category['commercial'], 'commercial')
                 commercial_text = self._create_category_text_summary(commercial_result, 'Commercial')
                 commercial_html = self._create_category_html_summary(commercial_result, 'Commercial')
                 
                 # Save commercial files
-                comm_text_path = os.path.join(self.output_dir, f"{base_filename}_commercial.txt")
-                with open(comm_text_path, 'w', encoding='utf-8') as f:
-                    f.write(commercial_text)
+                comm_text_path = prefix + "_commercial.txt"
+                writer.add(comm_text_path, commercial_text)
                 saved_files['commercial_text'] = comm_text_path
                 
-                comm_html_path = os.path.join(self.output_dir, f"{base_filename}_commercial.html")
-                with open(comm_html_path, 'w', encoding='utf-8') as f:
-                    f.write(commercial_html)
+                comm_html_path = prefix + "_commercial.html"
+                writer.add(comm_html_path, commercial_html)
                 saved_files['commercial_html'] = comm_html_path
                 
-                logging.info(f"Saved commercial email reports: {len(commercial_emails)} emails")
+                logging.info("Saved commercial email reports: %s emails", len(commercial_emails))
             
             if personal_emails:
-                personal_result = self._create_category_result(processing_result, personal_emails, 'personal')
+                personal_result = self._create_category_result(
+                    processing_result, personal_emails,
+                    summaries_by_category['personal'], 'personal')
                 personal_text = self._create_category_text_summary(personal_result, 'Personal')
                 personal_html = self._create_category_html_summary(personal_result, 'Personal')
                 
                 # Save personal files
-                pers_text_path = os.path.join(self.output_dir, f"{base_filename}_personal.txt")
-                with open(pers_text_path, 'w', encoding='utf-8') as f:
-                    f.write(personal_text)
+                pers_text_path = prefix + "_personal.txt"
+                writer.add(pers_text_path, personal_text)
                 saved_files['personal_text'] = pers_text_path
                 
-                pers_html_path = os.path.join(self.output_dir, f"{base_filename}_personal.html")
-                with open(pers_html_path, 'w', encoding='utf-8') as f:
-                    f.write(personal_html)
+                pers_html_path = prefix + "_personal.html"
+                writer.add(pers_html_path, personal_html)
                 saved_files['personal_html'] = pers_html_path
                 
-                logging.info(f"Saved personal email reports: {len(personal_emails)} emails")
+                logging.info("Saved personal email reports: %s emails", len(personal_emails))
             
             # Copy voice file if provided
             if voice_file_path and os.path.exists(voice_file_path):
-                voice_dest = os.path.join(self.output_dir, f"{base_filename}_voice.mp3")
-                import shutil
-                shutil.copy2(voice_file_path, voice_dest)
+                voice_dest = prefix + "_voice.mp3"
+                _fast_copy(voice_file_path, voice_dest)
                 saved_files['voice'] = voice_dest
-                logging.info(f"Saved voice summary: {voice_dest}")
+                logging.info("Saved voice summary: %s", voice_dest)
             
+            writer.flush()
+
             # Create summary index file
             self._update_categorized_index(base_filename, processing_result, saved_files)
             
-            logging.info(f"Categorized email summary saved successfully with {len(saved_files)} files")
+            logging.info("Categorized email summary saved successfully with %s files", len(saved_files))
             return saved_files
             
         except Exception as e:
-            logging.error(f"Failed to save categorized summary files: {e}")
+            logging.error("Failed to save categorized summary files: %s", e)
             return {}
     
-    def _create_category_result(self, original_result: Dict[str, Any], category_emails: list, category: str) -> Dict[str, Any]:
-        """Create a result dict for a specific category"""
-        # Filter email summaries for this category
-        category_summaries = [email for email in original_result.get('email_summaries', []) if email.get('category', '').lower() == category]
-        
-        # Calculate stats for this category
-        high_priority_count = len([e for e in category_summaries if e['priority'] == 'High'])
-        action_items_total = sum(len(e['action_items']) for e in category_summaries)
-        
+    def _create_category_result(self, original_result: Dict[str, Any], category_emails: list,
+                                category_summaries: list, category: str) -> Dict[str, Any]:
+        """Create a result dict for a pre-partitioned category.
+
+        Buckets the summaries by priority in the same pass that computes the
+        stats, so the text and HTML builders don't each re-scan the list.
+        """
+        priority_groups = {'High': [], 'Medium': [], 'Low': []}
+        action_items_total = 0
+        for email in category_summaries:
+            priority_groups.setdefault(email['priority'], []).append(email)
+            action_items_total += len(email['action_items'])
+
         return {
             'total_emails': len(category_emails),
             'email_summaries': category_summaries,
-            'high_priority_count': high_priority_count,
+            'priority_groups': priority_groups,
+            'high_priority_count': len(priority_groups['High']),
             'action_items_total': action_items_total,
             'processed_at': original_result.get('processed_at'),
             'category': category.title()
@@ -176,9 +381,9 @@ class FileSaver:
     
     def _create_category_text_summary(self, category_result: Dict[str, Any], category_name: str) -> str:
         """Create text summary for a specific category"""
-        email_summaries = category_result['email_summaries']
-        
-        text = f"""
+        # Accumulate fragments and join once — repeated += degrades to
+        # quadratic copying as the report grows
+        parts = [f"""
 {category_name.upper()} EMAIL SUMMARY REPORT
 Generated: {category_result['processed_at']}
 Total {category_name} Emails: {category_result['total_emails']}
@@ -186,60 +391,43 @@ High Priority: {category_result['high_priority_count']}
 Total Action Items: {category_result['action_items_total']}
 
 INDIVIDUAL {category_name.upper()} EMAIL SUMMARIES:
-"""
+"""]
         
-        # Group by priority
-        high_priority = [e for e in email_summaries if e['priority'] == 'High']
-        medium_priority = [e for e in email_summaries if e['priority'] == 'Medium']
-        low_priority = [e for e in email_summaries if e['priority'] == 'Low']
-        
-        for priority_group, title in [(high_priority, "HIGH PRIORITY"), 
-                                     (medium_priority, "MEDIUM PRIORITY"), 
-                                     (low_priority, "LOW PRIORITY")]:
+        # Priority buckets were built once in _create_category_result
+        priority_groups = category_result['priority_groups']
+
+        for priority_group, title in [(priority_groups['High'], "HIGH PRIORITY"),
+                                     (priority_groups['Medium'], "MEDIUM PRIORITY"),
+                                     (priority_groups['Low'], "LOW PRIORITY")]:
             if priority_group:
-                text += f"\n{title} {category_name.upper()} EMAILS:\n"
-                text += "-" * (len(title) + len(category_name) + 8) + "\n"
+                parts.append(f"\n{title} {category_name.upper()} EMAILS:\n")
+                parts.append("-" * (len(title) + len(category_name) + 8) + "\n")
                 
                 for email in priority_group:
-                    text += f"\nFrom: {email['sender']}\n"
-                    text += f"Subject: {email['subject']}\n"
-                    text += f"Summary: {email['summary']}\n"
+                    parts.append(f"\nFrom: {email['sender']}\n"
+                                 f"Subject: {email['subject']}\n"
+                                 f"Summary: {email['summary']}\n")
                     
                     if email['action_items']:
-                        text += f"Action Items:\n"
+                        parts.append("Action Items:\n")
                         for item in email['action_items']:
-                            text += f"  • {item}\n"
+                            parts.append(f"  • {item}\n")
                     
                     if email['requires_response']:
-                        text += "⚠️ REQUIRES RESPONSE\n"
+                        parts.append("⚠️ REQUIRES RESPONSE\n")
                     
-                    text += "\n"
+                    parts.append("\n")
         
-        return text
+        return ''.join(parts)
     
     def _create_category_html_summary(self, category_result: Dict[str, Any], category_name: str) -> str:
         """Create HTML summary for a specific category"""
         email_summaries = category_result['email_summaries']
         category_icon = "🏢" if category_name.lower() == "commercial" else "👤"
         
-        html = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; margin: 20px; }}
-                .header {{ background-color: #f4f4f4; padding: 15px; border-radius: 5px; margin-bottom: 20px; }}
-                .stats {{ display: flex; gap: 20px; margin-bottom: 20px; }}
-                .stat {{ background-color: #e9e9e9; padding: 10px; border-radius: 5px; text-align: center; }}
-                .priority-high {{ border-left: 5px solid #d32f2f; }}
-                .priority-medium {{ border-left: 5px solid #f57c00; }}
-                .priority-low {{ border-left: 5px solid #388e3c; }}
-                .email-item {{ margin-bottom: 20px; padding: 15px; border: 1px solid #ddd; border-radius: 5px; }}
-                .action-items {{ margin-top: 10px; }}
-                .action-items ul {{ margin: 5px 0; }}
-                .requires-response {{ color: #d32f2f; font-weight: bold; }}
-            </style>
-        </head>
-        <body>
+        # Static head is a module constant; only the dynamic header/stats
+        # fragment is formatted per call
+        parts = [_HTML_HEAD, f"""
             <div class="header">
                 <h1>{category_icon} {category_name} Email Summary Report</h1>
                 <p><strong>Generated:</strong> {category_result['processed_at']}</p>
@@ -261,59 +449,45 @@ INDIVIDUAL {category_name.upper()} EMAIL SUMMARIES:
             </div>
             
             <h2>📬 Individual {category_name} Email Summaries</h2>
-        """
+        """]
         
-        # Group by priority
+        # Priority buckets were built once in _create_category_result
+        buckets = category_result['priority_groups']
         priority_groups = [
-            ([e for e in email_summaries if e['priority'] == 'High'], "🔴 High Priority", "priority-high"),
-            ([e for e in email_summaries if e['priority'] == 'Medium'], "🟡 Medium Priority", "priority-medium"),
-            ([e for e in email_summaries if e['priority'] == 'Low'], "🟢 Low Priority", "priority-low")
+            (buckets['High'], "🔴 High Priority", "priority-high"),
+            (buckets['Medium'], "🟡 Medium Priority", "priority-medium"),
+            (buckets['Low'], "🟢 Low Priority", "priority-low")
         ]
         
         for emails, title, css_class in priority_groups:
             if emails:
-                html += f"<h3>{title}</h3>"
+                parts.append(f"<h3>{title}</h3>")
                 
                 for email in emails:
-                    response_indicator = "⚠️ REQUIRES RESPONSE" if email['requires_response'] else ""
-                    
-                    html += f"""
+                    parts.append(f"""
                     <div class="email-item {css_class}">
                         <h4>{email['subject']}</h4>
                         <p><strong>From:</strong> {email['sender']}</p>
                         <p><strong>Summary:</strong> {email['summary']}</p>
-                    """
+                    """)
                     
                     if email['action_items']:
-                        html += "<div class='action-items'><strong>Action Items:</strong><ul>"
+                        parts.append("<div class='action-items'><strong>Action Items:</strong><ul>")
                         for item in email['action_items']:
-                            html += f"<li>{item}</li>"
-                        html += "</ul></div>"
+                            parts.append(f"<li>{item}</li>")
+                        parts.append("</ul></div>")
                     
                     if email['requires_response']:
-                        html += f"<p class='requires-response'>{response_indicator}</p>"
+                        parts.append("<p class='requires-response'>⚠️ REQUIRES RESPONSE</p>")
                     
-                    html += "</div>"
+                    parts.append("</div>")
         
-        html += "</body></html>"
-        return html
+        parts.append("</body></html>")
+        return ''.join(parts)
     
     def _update_index(self, base_filename: str, processing_result: Dict[str, Any], saved_files: Dict[str, str]):
         """Update index file with summary information"""
-        index_path = os.path.join(self.output_dir, "index.json")
-        
-        # Load existing index or create new one
-        index_data = []
-        if os.path.exists(index_path):
-            try:
-                with open(index_path, 'r', encoding='utf-8') as f:
-                    index_data = json.load(f)
-            except Exception as e:
-                logging.warning(f"Could not load existing index: {e}")
-                index_data = []
-        
-        # Add new entry
-        new_entry = {
+        self._append_index_entry({
             'timestamp': processing_result.get('processed_at'),
             'base_filename': base_filename,
             'total_emails': processing_result.get('total_emails', 0),
@@ -321,38 +495,11 @@ INDIVIDUAL {category_name.upper()} EMAIL SUMMARIES:
             'action_items_total': processing_result.get('action_items_total', 0),
             'files': saved_files,
             'categorized': False
-        }
-        
-        index_data.append(new_entry)
-        
-        # Keep only last 100 entries
-        if len(index_data) > 100:
-            index_data = index_data[-100:]
-        
-        # Save updated index
-        try:
-            with open(index_path, 'w', encoding='utf-8') as f:
-                json.dump(index_data, f, indent=2, ensure_ascii=False)
-            logging.info(f"Updated summary index: {index_path}")
-        except Exception as e:
-            logging.error(f"Failed to update index: {e}")
+        })
     
     def _update_categorized_index(self, base_filename: str, processing_result: Dict[str, Any], saved_files: Dict[str, str]):
         """Update index file with categorized summary information"""
-        index_path = os.path.join(self.output_dir, "index.json")
-        
-        # Load existing index or create new one
-        index_data = []
-        if os.path.exists(index_path):
-            try:
-                with open(index_path, 'r', encoding='utf-8') as f:
-                    index_data = json.load(f)
-            except Exception as e:
-                logging.warning(f"Could not load existing index: {e}")
-                index_data = []
-        
-        # Add new entry with categorization info
-        new_entry = {
+        self._append_index_entry({
             'timestamp': processing_result.get('processed_at'),
             'base_filename': base_filename,
             'total_emails': processing_result.get('total_emails', 0),
@@ -362,77 +509,137 @@ INDIVIDUAL {category_name.upper()} EMAIL SUMMARIES:
             'action_items_total': processing_result.get('action_items_total', 0),
             'files': saved_files,
             'categorized': True
-        }
-        
-        index_data.append(new_entry)
-        
-        # Keep only last 100 entries
-        if len(index_data) > 100:
-            index_data = index_data[-100:]
-        
-        # Save updated index
+        })
+
+    def _append_index_entry(self, new_entry: Dict[str, Any]):
+        """Append one entry to the JSONL index.
+
+        The old list-based index.json was fully read, parsed, mutated and
+        rewritten on every save. An append-only index.jsonl makes each update
+        a single O(1) write; trimming to the last 100 entries happens lazily,
+        only once the log grows well past the cap.
+        """
+        index_path = self._index_path
         try:
-            with open(index_path, 'w', encoding='utf-8') as f:
-                json.dump(index_data, f, indent=2, ensure_ascii=False)
-            logging.info(f"Updated categorized summary index: {index_path}")
+            if orjson is not None:
+                line = orjson.dumps(new_entry) + b'\n'
+            else:
+                line = (json.dumps(new_entry, separators=(',', ':'),
+                                   ensure_ascii=True) + '\n').encode('utf-8')
+            with open(index_path, 'ab', buffering=0) as f:
+                f.write(line)
+            self._index_exists = True
+
+            # Lazy compaction: rewrite only when the log is far past the cap
+            if os.path.getsize(index_path) > self.INDEX_COMPACT_BYTES:
+                self._compact_index(index_path)
+
+            logging.info("Updated summary index: %s", index_path)
         except Exception as e:
-            logging.error(f"Failed to update index: {e}")
+            logging.error("Failed to update index: %s", e)
+
+    def _compact_index(self, index_path: str):
+        """Trim the JSONL index down to the most recent entries"""
+        with open(index_path, 'rb') as f:
+            lines = f.read().splitlines()
+        with open(index_path, 'wb') as f:
+            f.write(b'\n'.join(lines[-self.INDEX_MAX_ENTRIES:]) + b'\n')
     
     def get_recent_summaries(self, limit: int = 10) -> list:
-        """Get list of recent summaries"""
-        index_path = os.path.join(self.output_dir, "index.json")
-        
-        if not os.path.exists(index_path):
-            return []
-        
+        """Get list of recent summaries (newest first)"""
+        index_path = self._index_path
+
         try:
-            with open(index_path, 'r', encoding='utf-8') as f:
-                index_data = json.load(f)
-            
-            # Return most recent summaries
-            return index_data[-limit:][::-1]  # Reverse to get newest first
-            
+            if not self._index_exists and not os.path.exists(index_path):
+                # Fall back to a legacy list-based index if one is present
+                if os.path.exists(self._legacy_index_path):
+                    return _load_json(self._legacy_index_path)[-limit:][::-1]
+                return []
+
+            # Tail-read: parse only the last chunk of the log, not the whole file
+            loads = orjson.loads if orjson is not None else json.loads
+            with open(index_path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                f.seek(max(0, size - self.INDEX_TAIL_BYTES))
+                chunk = f.read()
+
+            lines = chunk.split(b'\n')
+            if size > self.INDEX_TAIL_BYTES:
+                lines = lines[1:]  # first line may be truncated by the seek
+
+            entries = []
+            for line in lines:
+                if line.strip():
+                    try:
+                        entries.append(loads(line))
+                    except ValueError:
+                        continue
+
+            return entries[-limit:][::-1]  # Reverse to get newest first
+
         except Exception as e:
-            logging.error(f"Failed to load recent summaries: {e}")
+            logging.error("Failed to load recent summaries: %s", e)
             return []
     
     def cleanup_old_files(self, days_to_keep: int = 30):
         """Clean up summary files older than specified days"""
         try:
-            cutoff_time = datetime.now().timestamp() - (days_to_keep * 24 * 60 * 60)
-            
-            for filename in os.listdir(self.output_dir):
-                if filename == "index.json":
-                    continue
-                
-                file_path = os.path.join(self.output_dir, filename)
-                if os.path.isfile(file_path):
-                    file_time = os.path.getmtime(file_path)
-                    if file_time < cutoff_time:
-                        os.remove(file_path)
-                        logging.info(f"Cleaned up old file: {filename}")
+            now = datetime.now().timestamp()
+            cutoff_time = now - (days_to_keep * 24 * 60 * 60)
+            compact_time = now - (self.COMPACT_AFTER_DAYS * 24 * 60 * 60)
+
+            # scandir serves type and mtime from the cached DirEntry stat,
+            # avoiding an extra stat() per file
+            with os.scandir(self.output_dir) as entries:
+                for entry in entries:
+                    if entry.name in ("index.json", "index.jsonl"):
+                        continue
+
+                    if not entry.is_file():
+                        continue
+
+                    mtime = entry.stat().st_mtime
+                    if mtime < cutoff_time:
+                        os.remove(entry.path)
+                        logging.info("Cleaned up old file: %s", entry.name)
+                    elif (self.compact and mtime < compact_time
+                          and not entry.name.endswith('.gz')):
+                        # Level 1 gives most of the ratio on JSON/HTML text at
+                        # near-streaming speed
+                        self._compress_file(entry.path)
                         
         except Exception as e:
-            logging.error(f"Failed to cleanup old files: {e}")
+            logging.error("Failed to cleanup old files: %s", e)
+
+    def _compress_file(self, file_path: str):
+        """Replace a summary file with a gzipped copy to reclaim disk space"""
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        with open(file_path + '.gz', 'wb', buffering=0) as f:
+            f.write(gzip.compress(data, compresslevel=1))
+        os.remove(file_path)
+        logging.info("Compressed old file: %s", os.path.basename(file_path))
     
     def get_summary_stats(self) -> Dict[str, Any]:
         """Get statistics about saved summaries"""
         try:
             if not os.path.exists(self.output_dir):
                 return {'total_summaries': 0, 'total_files': 0, 'disk_usage': 0}
-            
-            files = os.listdir(self.output_dir)
-            total_files = len(files)
-            
-            # Count summary sets (each summary creates multiple files)
-            json_files = len([f for f in files if f.endswith('.json') and f != 'index.json'])
-            
-            # Calculate disk usage
+
+            # One scandir pass gathers counts and sizes from cached stat info
+            total_files = 0
+            json_files = 0
             total_size = 0
-            for filename in files:
-                file_path = os.path.join(self.output_dir, filename)
-                if os.path.isfile(file_path):
-                    total_size += os.path.getsize(file_path)
+            with os.scandir(self.output_dir) as entries:
+                for entry in entries:
+                    total_files += 1
+                    if not entry.is_file():
+                        continue
+                    total_size += entry.stat().st_size
+                    # Count summary sets (each summary creates multiple files)
+                    if entry.name.endswith('.json') and entry.name != 'index.json':
+                        json_files += 1
             
             return {
                 'total_summaries': json_files,
@@ -442,5 +649,5 @@ INDIVIDUAL {category_name.upper()} EMAIL SUMMARIES:
             }
             
         except Exception as e:
-            logging.error(f"Failed to get summary stats: {e}")
+            logging.error("Failed to get summary stats: %s", e)
             return {'error': str(e)}
\ No newline at end of file
@@ -1,42 +1,116 @@
 import os
-import pickle
+import shelve
+import tempfile
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 import base64
 import email
+import html
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from typing import List, Dict, Any
 import logging
+from tqdm import tqdm
+
+# selectolax (C-backed Modest engine) strips HTML far faster than any
+# pure-Python parser; fall back to regex stripping when it is absent
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+_SCRIPT_STYLE_RE = re.compile(r'<(script|style)[^>]*>.*?</\1>', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
 
 SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 
 class GmailClient:
-    def __init__(self, credentials_path: str, token_path: str):
+    # Gmail's batch HTTP endpoint accepts up to 100 subrequests per call,
+    # but Google recommends at most 50 to avoid rate-limit rejections
+    BATCH_SIZE = 50
+
+    # Workers used when falling back to per-message fetches
+    FETCH_WORKERS = 16
+
+    # Only the parts of the payload _parse_message actually reads. 'parts'
+    # is selected unrestricted: a field mask cannot express recursion, and
+    # narrowing it to parts(mimeType,body/data) strips the nested
+    # parts[].parts that multipart/mixed -> multipart/alternative mail
+    # keeps its text leaves in, which emptied those bodies
+    GET_FIELDS = 'id,payload(mimeType,headers,body/data,parts)'
+
+    # Snippet mode needs no body parts at all — the server-generated
+    # snippet plus the headers cover the whole parsed message
+    SNIPPET_FIELDS = 'id,snippet,payload/headers'
+
+    # Cap on cached parsed messages before eviction kicks in
+    CACHE_MAX_ENTRIES = 10000
+
+    # Bumped whenever _parse_message changes shape, so stale entries from
+    # older parse logic are never served
+    CACHE_SCHEMA_VERSION = 1
+
+    def __init__(self, credentials_path: str, token_path: str, body_mode: str = 'full'):
         self.credentials_path = credentials_path
         self.token_path = token_path
+        self.body_mode = body_mode
         self.service = None
+        # Message bodies are immutable once sent, so parsed messages need
+        # no time-based invalidation — but the key carries the body mode
+        # and parse-schema version, so a snippet-mode run never poisons a
+        # later full-mode run (and vice versa). shelve/dbm is not
+        # thread-safe and the fetch worker writes while the pagination
+        # thread reads, so all access goes through _cache_lock.
+        self._cache_lock = threading.Lock()
+        try:
+            self._msg_cache = shelve.open(
+                os.path.join(tempfile.gettempdir(), 'mailpilot_msgcache'))
+        except Exception as e:
+            logging.warning("Message cache unavailable: %s", e)
+            self._msg_cache = None
         self._authenticate()
     
     def _authenticate(self):
         print("🔐 Starting Gmail authentication process...")
-        logging.info(f"Looking for credentials at: {self.credentials_path}")
-        logging.info(f"Looking for token at: {self.token_path}")
+        logging.info("Looking for credentials at: %s", self.credentials_path)
+        logging.info("Looking for token at: %s", self.token_path)
         
         creds = None
         if os.path.exists(self.token_path):
             print("🎫 Found existing authentication token, loading...")
             logging.info("Loading existing authentication token")
-            with open(self.token_path, 'rb') as token:
-                creds = pickle.load(token)
+            try:
+                creds = Credentials.from_authorized_user_file(self.token_path, SCOPES)
+            except ValueError:
+                # Token from an older version that stored pickled credentials
+                import pickle
+                try:
+                    with open(self.token_path, 'rb') as token:
+                        creds = pickle.load(token)
+                except Exception:
+                    logging.warning("Could not load existing token, re-authenticating")
         else:
             print("🆕 No existing token found, will need fresh authentication")
             logging.info("No existing token found")
         
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                print("🔄 Token expired, refreshing...")
-                logging.info("Refreshing expired token")
+        # Refresh proactively when the token is expired OR about to expire,
+        # so the ~200ms refresh round-trip lands here rather than racing the
+        # first API call mid-fetch
+        needs_refresh = False
+        if creds and creds.refresh_token:
+            if not creds.valid:
+                needs_refresh = creds.expired
+            elif creds.expiry and creds.expiry - datetime.utcnow() < timedelta(minutes=5):
+                needs_refresh = True
+
+        if not creds or not creds.valid or needs_refresh:
+            if needs_refresh:
+                print("🔄 Token expired or expiring soon, refreshing...")
+                logging.info("Refreshing expiring token")
                 creds.refresh(Request())
                 print("✅ Token refreshed successfully")
             else:
@@ -48,14 +122,29 @@ class GmailClient:
                 print("✅ OAuth2 authentication completed")
             
             print("💾 Saving authentication token for future use...")
-            with open(self.token_path, 'wb') as token:
-                pickle.dump(creds, token)
+            with open(self.token_path, 'w') as token:
+                token.write(creds.to_json())
             logging.info("Authentication token saved")
         else:
             print("✅ Using valid existing authentication token")
         
         print("🔗 Establishing Gmail API connection...")
-        self.service = build('gmail', 'v1', credentials=creds)
+        import httplib2
+        from google_auth_httplib2 import AuthorizedHttp
+
+        self._creds = creds
+        # One authorized transport shared by every .execute() keeps the TCP/
+        # TLS session alive across the whole run instead of re-handshaking;
+        # the disk cache turns refetches of immutable message bodies into
+        # ETag-conditional GETs
+        cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'mail-pilot', 'http')
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            http = httplib2.Http(cache=cache_dir)
+        except OSError:
+            http = httplib2.Http()
+        self._http = AuthorizedHttp(creds, http=http)
+        self.service = build('gmail', 'v1', http=self._http)
         
         # Get user profile to show which account is connected
         try:
@@ -64,7 +153,7 @@ class GmailClient:
             total_messages = profile.get('messagesTotal', 'Unknown')
             print(f"✅ Successfully connected to Gmail account: {email_address}")
             print(f"📊 Account has {total_messages} total messages")
-            logging.info(f"Gmail API authenticated successfully for {email_address}")
+            logging.info("Gmail API authenticated successfully for %s", email_address)
         except Exception as e:
             print("✅ Gmail API connection established (profile info unavailable)")
             logging.info("Gmail API authenticated successfully")
@@ -72,83 +161,199 @@ class GmailClient:
     def get_unread_messages(self, query: str = 'is:unread') -> List[Dict[str, Any]]:
         try:
             print("📧 Connecting to Gmail...")
-            logging.info(f"Fetching messages with query: {query}")
-            
-            # Get all messages with pagination
-            all_messages = []
-            next_page_token = None
-            page_count = 0
-            
-            while True:
-                page_count += 1
-                print(f"📄 Fetching page {page_count} of messages...")
-                
-                request_params = {'userId': 'me', 'q': query}
-                if next_page_token:
-                    request_params['pageToken'] = next_page_token
-                
-                results = self.service.users().messages().list(**request_params).execute()
-                
-                messages = results.get('messages', [])
-                all_messages.extend(messages)
-                
-                next_page_token = results.get('nextPageToken')
-                if not next_page_token:
-                    break
-                
-                print(f"   Found {len(messages)} messages on page {page_count}, continuing...")
-            
-            print(f"📬 Found {len(all_messages)} total messages across {page_count} pages")
-            logging.info(f"Found {len(all_messages)} messages to process across {page_count} pages")
+            logging.info("Fetching messages with query: %s", query)
+
+            # Pipeline: the pagination loop keeps listing pages while a
+            # background worker batch-fetches the previous pages' messages,
+            # so list latency and fetch latency overlap instead of stacking
             unread_emails = []
-            
-            if len(all_messages) > 0:
-                print("📥 Downloading email content...")
-                from tqdm import tqdm
-                
-                # Progress bar for email downloading
-                progress_bar = tqdm(
-                    all_messages, 
-                    desc="📥 Downloading", 
-                    unit="email",
-                    bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} emails [{elapsed}<{remaining}]'
-                )
-                
-                for message in progress_bar:
-                    msg = self.service.users().messages().get(
-                        userId='me', id=message['id'], format='full'
-                    ).execute()
-                    
-                    email_data = self._parse_message(msg)
-                    sender_short = email_data['sender'].split('@')[0][:20]
-                    subject_short = email_data['subject'][:30] + "..." if len(email_data['subject']) > 30 else email_data['subject']
-                    
-                    progress_bar.set_description(f"📥 Downloaded: {sender_short}")
-                    progress_bar.set_postfix_str(f"'{subject_short}'")
-                    
+            cached_count = 0
+            total_ids = 0
+            page_count = 0
+            next_page_token = None
+            pending = []
+            futures = []
+
+            progress_bar = tqdm(
+                total=0,
+                desc="📥 Downloading",
+                unit="email",
+                bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} emails [{elapsed}<{remaining}]'
+            )
+
+            def _collect_message(request_id, response, exception):
+                if exception is None:
+                    email_data = self._parse_message(response)
                     # Log detailed info about each email
-                    logging.info(f"Downloaded email: '{email_data['subject']}' from {email_data['sender']} ({email_data['date']})")
-                    
+                    logging.info("Downloaded email: '%s' from %s (%s)", email_data['subject'], email_data['sender'], email_data['date'])
                     unread_emails.append(email_data)
-                
-                progress_bar.close()
+                    self._cache_message(email_data)
+                else:
+                    logging.error("Failed to download message: %s", exception)
+                progress_bar.update(1)
+
+            with ThreadPoolExecutor(max_workers=1) as fetch_pool:
+                while True:
+                    page_count += 1
+                    print(f"📄 Fetching page {page_count} of messages...")
+
+                    # Only ids and the page token are used from the list response
+                    request_params = {'userId': 'me', 'q': query,
+                                      'fields': 'nextPageToken,messages/id'}
+                    if next_page_token:
+                        request_params['pageToken'] = next_page_token
+
+                    results = self.service.users().messages().list(**request_params).execute()
+
+                    messages = results.get('messages', [])
+                    total_ids += len(messages)
+
+                    # Serve previously parsed messages straight from the
+                    # cache and queue only the misses for fetching
+                    for message in messages:
+                        if self._msg_cache is not None:
+                            with self._cache_lock:
+                                cached = self._msg_cache.get(self._cache_key(message['id']))
+                        else:
+                            cached = None
+                        if cached is not None:
+                            unread_emails.append(cached)
+                            cached_count += 1
+                        else:
+                            pending.append(message)
+
+                    progress_bar.total = total_ids - cached_count
+                    progress_bar.refresh()
+
+                    while len(pending) >= self.BATCH_SIZE:
+                        chunk = pending[:self.BATCH_SIZE]
+                        del pending[:self.BATCH_SIZE]
+                        futures.append(fetch_pool.submit(self._fetch_chunk, chunk, _collect_message))
+
+                    next_page_token = results.get('nextPageToken')
+                    if not next_page_token:
+                        break
+
+                    print(f"   Found {len(messages)} messages on page {page_count}, continuing...")
+
+                if pending:
+                    futures.append(fetch_pool.submit(self._fetch_chunk, pending, _collect_message))
+
+                for future in futures:
+                    future.result()
+
+            progress_bar.close()
+
+            print(f"📬 Found {total_ids} total messages across {page_count} pages")
+            logging.info("Found %s messages to process across %s pages", total_ids, page_count)
+            if cached_count:
+                print(f"💾 {cached_count} messages served from local cache")
+                logging.info("%s messages served from cache, fetched %s", cached_count, total_ids - cached_count)
+            if total_ids:
                 print("✅ All emails downloaded successfully")
-            
-            logging.info(f"Successfully retrieved {len(unread_emails)} unread messages")
+
+            logging.info("Successfully retrieved %s unread messages", len(unread_emails))
             return unread_emails
-            
+
         except Exception as e:
-            logging.error(f"Error retrieving unread messages: {e}")
+            logging.error("Error retrieving unread messages: %s", e)
             return []
-    
+
+    def _fetch_chunk(self, chunk: List[Dict[str, Any]], callback):
+        """Batch-fetch one chunk of message IDs on the calling thread.
+
+        Runs off the main thread during pagination, so the batch executes
+        on its own AuthorizedHttp — httplib2 connections are not safe to
+        share with the concurrent list calls.
+        """
+        import httplib2
+        from google_auth_httplib2 import AuthorizedHttp
+
+        http = AuthorizedHttp(self._creds, http=httplib2.Http())
+        # The batch endpoint packs up to BATCH_SIZE GETs into one HTTP
+        # round-trip instead of one serial round-trip per message.
+        # _parse_message reads only headers and body parts, so the
+        # fields mask drops labels/snippet/sizeEstimate from responses.
+        try:
+            batch = self.service.new_batch_http_request(callback=callback)
+            for message in chunk:
+                batch.add(self.service.users().messages().get(
+                    userId='me', id=message['id'], **self._get_params()
+                ))
+            batch.execute(http=http)
+        except Exception as e:
+            # Batch endpoint unavailable (deprecated for some scopes) —
+            # overlap individual fetches with threads
+            logging.warning("Batch fetch failed (%s), falling back to threaded fetch", e)
+            self._fetch_messages_threaded(chunk, callback)
+
+    def _cache_key(self, message_id: str) -> str:
+        """Cache key for a message: parse version and body mode included,
+        so a snippet-mode entry is never served as a full body"""
+        return f"{self.CACHE_SCHEMA_VERSION}:{self.body_mode}:{message_id}"
+
+    def _cache_message(self, email_data: Dict[str, Any]):
+        """Store a parsed message in the on-disk cache, evicting past the cap"""
+        if self._msg_cache is None:
+            return
+        try:
+            with self._cache_lock:
+                if len(self._msg_cache) >= self.CACHE_MAX_ENTRIES:
+                    # shelve has no access ordering; dropping an arbitrary slice
+                    # is fine since any evicted message is just refetched once
+                    for key in list(self._msg_cache.keys())[:self.CACHE_MAX_ENTRIES // 10]:
+                        del self._msg_cache[key]
+                self._msg_cache[self._cache_key(email_data['id'])] = email_data
+        except Exception as e:
+            logging.warning("Failed to cache message: %s", e)
+
+    def _fetch_messages_threaded(self, messages: List[Dict[str, Any]], callback):
+        """Fetch messages individually with a thread pool.
+
+        Used when the batch endpoint is unavailable: the round-trips are pure
+        I/O wait, so overlapping them cuts serial latency to roughly
+        ceil(N / FETCH_WORKERS) round-trips. googleapiclient http objects are
+        not thread-safe, so each worker executes on its own authorized http.
+        """
+        import httplib2
+        from google_auth_httplib2 import AuthorizedHttp
+
+        def _fetch(message_id):
+            http = AuthorizedHttp(self._creds, http=httplib2.Http())
+            return self.service.users().messages().get(
+                userId='me', id=message_id, **self._get_params()
+            ).execute(http=http)
+
+        with ThreadPoolExecutor(max_workers=self.FETCH_WORKERS) as executor:
+            futures = [executor.submit(_fetch, m['id']) for m in messages]
+            for future in futures:
+                try:
+                    callback(None, future.result(), None)
+                except Exception as e:
+                    callback(None, None, e)
+
+    def _get_params(self) -> Dict[str, str]:
+        """Per-message GET parameters for the configured body mode"""
+        if self.body_mode == 'snippet':
+            # format=metadata skips body transfer server-side; responses
+            # drop from kilobytes to a couple hundred bytes each
+            return {'format': 'metadata', 'fields': self.SNIPPET_FIELDS}
+        return {'format': 'full', 'fields': self.GET_FIELDS}
+
     def _parse_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
-        headers = message['payload'].get('headers', [])
-        
-        subject = next((h['value'] for h in headers if h['name'] == 'Subject'), 'No Subject')
-        sender = next((h['value'] for h in headers if h['name'] == 'From'), 'Unknown Sender')
-        date = next((h['value'] for h in headers if h['name'] == 'Date'), 'Unknown Date')
+        # One pass over the headers instead of three next() scans; keyed
+        # lowercase since header names are case-insensitive
+        headers = {h['name'].lower(): h['value']
+                   for h in message['payload'].get('headers', ())}
+
+        subject = headers.get('subject', 'No Subject')
+        sender = headers.get('from', 'Unknown Sender')
+        date = headers.get('date', 'Unknown Date')
         
-        body = self._extract_body(message['payload'])
+        if self.body_mode == 'snippet':
+            body = message.get('snippet', '')
+        else:
+            body = self._extract_body(message['payload'])
         
         return {
             'id': message['id'],
@@ -158,26 +363,73 @@ class GmailClient:
             'body': body
         }
     
+    # Body length kept for AI analysis, and the matching base64 length
+    # (4 encoded chars per 3 bytes, rounded to a 4-char boundary)
+    BODY_CHAR_LIMIT = 5000
+    _BODY_B64_LIMIT = (BODY_CHAR_LIMIT * 4 // 3 + 7) // 4 * 4
+
     def _extract_body(self, payload: Dict[str, Any]) -> str:
-        body = ""
-        
-        if 'parts' in payload:
-            for part in payload['parts']:
-                if part['mimeType'] == 'text/plain':
-                    data = part['body']['data']
-                    body = base64.urlsafe_b64decode(data).decode('utf-8')
-                    break
-                elif part['mimeType'] == 'text/html':
-                    data = part['body']['data']
-                    body = base64.urlsafe_b64decode(data).decode('utf-8')
-        else:
-            if payload['body'].get('data'):
-                body = base64.urlsafe_b64decode(
-                    payload['body']['data']
-                ).decode('utf-8')
-        
-        return body[:5000]  # Increased body length for better AI analysis
+        # Breadth-first walk over the MIME tree (multipart/alternative can
+        # nest parts inside parts): return on the first text/plain found,
+        # remember the first text/html as fallback, and decode exactly once
+        data = None
+        is_html = False
+        queue = [payload]
+        while queue:
+            part = queue.pop(0)
+            if 'parts' in part:
+                queue.extend(part['parts'])
+            elif part.get('mimeType') == 'text/plain' and part.get('body', {}).get('data'):
+                data = part['body']['data']
+                is_html = False
+                break
+            elif data is None:
+                # First non-plain leaf with data (usually text/html) is the
+                # fallback if no plain part ever turns up
+                data = part.get('body', {}).get('data')
+                is_html = part.get('mimeType') == 'text/html'
+
+        if not data:
+            return ""
+
+        # Slice the base64 before decoding so oversized bodies never cost a
+        # full decode just to be truncated afterwards
+        body = base64.urlsafe_b64decode(data[:self._BODY_B64_LIMIT]).decode('utf-8', 'replace')
+        if is_html:
+            # Markup is dead weight for the LLM — strip it to text before
+            # truncating so the char budget carries actual content
+            body = self._strip_html(body)
+        return body[:self.BODY_CHAR_LIMIT]
+
+    @staticmethod
+    def _strip_html(markup: str) -> str:
+        """Reduce an HTML fragment to its visible text"""
+        if HTMLParser is not None:
+            node = HTMLParser(markup).body
+            return node.text(separator=' ', strip=True) if node is not None else ''
+        text = _TAG_RE.sub(' ', _SCRIPT_STYLE_RE.sub(' ', markup))
+        return ' '.join(html.unescape(text).split())
     
+    def mark_as_read_bulk(self, message_ids: List[str]):
+        """Mark many messages read in one RPC via batchModify.
+
+        batchModify accepts up to 1000 IDs per request, so a whole
+        processing cycle's worth of read-markers costs one HTTP round
+        trip instead of one modify call per message.
+        """
+        if not message_ids:
+            return
+        try:
+            for start in range(0, len(message_ids), 1000):
+                self.service.users().messages().batchModify(
+                    userId='me',
+                    body={'ids': message_ids[start:start + 1000],
+                          'removeLabelIds': ['UNREAD']}
+                ).execute()
+            logging.info("Marked %s messages as read", len(message_ids))
+        except Exception as e:
+            logging.error("Error marking messages as read: %s", e)
+
     def mark_as_read(self, message_id: str):
         try:
             self.service.users().messages().modify(
@@ -185,6 +437,6 @@ class GmailClient:
                 id=message_id,
                 body={'removeLabelIds': ['UNREAD']}
             ).execute()
-            logging.info(f"Marked message {message_id} as read")
+            logging.info("Marked message %s as read", message_id)
         except Exception as e:
-            logging.error(f"Error marking message as read: {e}")
\ No newline at end of file
+            logging.error("Error marking message as read: %s", e)
\ No newline at end of file
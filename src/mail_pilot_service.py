@@ -2,20 +2,23 @@ import logging
 import os
 import signal
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict
 import tempfile
 
 from .config import load_config, AppConfig
-from .gmail_client import GmailClient
-from .ollama_client import OllamaClient
-from .email_processor import EmailProcessor
-from .email_sender import EmailSender
-from .voice_generator import VoiceGenerator
-from .scheduler import EmailSummaryScheduler, ManualRunner
-from .file_saver import FileSaver
 from .email_menu import EmailMenu
 
+# Component imports are deferred to initialize(): the Gmail/LLM/voice
+# stack (google clients, ML categorizers, TTS) takes noticeable time and
+# memory to import, and short-lived invocations like --status never use it
+
 class MailPilotService:
+    # Seconds an Ollama status probe stays fresh for repeated get_status calls
+    STATUS_CACHE_TTL = 30
+
     def __init__(self, config_file: str = '../.env'):
         self.config = load_config(config_file)
         self.gmail_client = None
@@ -27,6 +30,9 @@ class MailPilotService:
         self.file_saver = None
         self.menu = EmailMenu()
         self.running = False
+        self._stop_event = threading.Event()
+        self._connections_verified = False
+        self._status_cache = None
         
         # Setup signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -37,29 +43,30 @@ class MailPilotService:
         try:
             logging.info("Initializing Mail Pilot Service...")
             
+            from .gmail_client import GmailClient
+            from .ollama_client import OllamaClient
+            from .email_processor import EmailProcessor
+            from .scheduler import EmailSummaryScheduler
+            from .file_saver import FileSaver
+            
             # Initialize Gmail client
             self.gmail_client = GmailClient(
                 credentials_path=self.config.gmail.credentials_path,
-                token_path=self.config.gmail.token_path
+                token_path=self.config.gmail.token_path,
+                body_mode=getattr(self.config.gmail, 'body_mode', 'full')
             )
             
             # Initialize Ollama client
             self.ollama_client = OllamaClient(
                 base_url=self.config.ollama.url,
-                model=self.config.ollama.model
+                model=self.config.ollama.model,
+                max_parallel=getattr(self.config.ollama, 'max_parallel', 4),
+                keep_alive=f"{max(self.config.scheduler.interval_hours, 1)}h"
             )
             
-            # Test Ollama connection thoroughly
-            logging.info("🔍 Testing Ollama connection and model availability...")
-            if not self.ollama_client.test_connection():
-                logging.error("❌ Failed to connect to Ollama service or model not available")
-                logging.error("🔧 Troubleshooting steps:")
-                logging.error("   1. Check if Ollama is running: ollama list")
-                logging.error("   2. If not running, Ollama should start automatically")
-                logging.error("   3. If model missing, run: ollama pull mistral")
-                logging.error("   4. Check Ollama URL in .env file")
-                return False
-            
+            # Connection probes are deferred to the first processing cycle
+            # (_verify_connections) so cold start stays fast
+
             # Initialize email processor
             self.email_processor = EmailProcessor(
                 gmail_client=self.gmail_client,
@@ -68,6 +75,7 @@ class MailPilotService:
             
             # Initialize email sender (only if enabled)
             if self.config.email.enabled:
+                from .email_sender import EmailSender
                 self.email_sender = EmailSender(
                     smtp_server=self.config.email.smtp_server,
                     smtp_port=self.config.email.smtp_port,
@@ -75,20 +83,18 @@ class MailPilotService:
                     email_password=self.config.email.email_password
                 )
                 
-                # Test email connection
-                if not self.email_sender.test_connection():
-                    logging.error("Failed to connect to email service")
-                    return False
-                    
                 logging.info("Email sending is enabled and configured")
             else:
                 logging.info("Email sending is disabled - summaries will be saved locally only")
             
-            # Initialize voice generator
-            self.voice_generator = VoiceGenerator(
-                language=self.config.voice.language,
-                enabled=self.config.voice.enabled
-            )
+            # Initialize voice generator (only when enabled — keeps the TTS
+            # stack out of memory otherwise)
+            if self.config.voice.enabled:
+                from .voice_generator import VoiceGenerator
+                self.voice_generator = VoiceGenerator(
+                    language=self.config.voice.language,
+                    enabled=True
+                )
             
             # Initialize file saver
             self.file_saver = FileSaver()
@@ -103,9 +109,32 @@ class MailPilotService:
             return True
             
         except Exception as e:
-            logging.error(f"Failed to initialize service: {e}")
+            logging.error("Failed to initialize service: %s", e)
             return False
     
+    def _verify_connections(self) -> bool:
+        """Probe Ollama (and SMTP when enabled) once, on first real use"""
+        if self._connections_verified:
+            return True
+
+        logging.info("🔍 Testing Ollama connection and model availability...")
+        if not self.ollama_client.test_connection():
+            logging.error("❌ Failed to connect to Ollama service or model not available")
+            logging.error("🔧 Troubleshooting steps:")
+            logging.error("   1. Check if Ollama is running: ollama list")
+            logging.error("   2. If not running, Ollama should start automatically")
+            logging.error("   3. If model missing, run: ollama pull mistral")
+            logging.error("   4. Check Ollama URL in .env file")
+            return False
+
+        if self.config.email.enabled and self.email_sender:
+            if not self.email_sender.test_connection():
+                logging.error("Failed to connect to email service")
+                return False
+
+        self._connections_verified = True
+        return True
+
     def process_emails(self, query: str = 'is:unread', options: Dict = None):
         """Main email processing function"""
         try:
@@ -116,6 +145,10 @@ class MailPilotService:
             if options is None:
                 options = {'categorize_emails': True, 'voice_enabled': self.config.voice.enabled}
             
+            if not self._verify_connections():
+                logging.error("❌ Connection checks failed - skipping this cycle")
+                return
+            
             # Process emails with categorization enabled by default
             logging.info("Step 1/6: Processing emails with AI and automatic categorization")
             result = self.email_processor.process_unread_emails(query, options)
@@ -125,12 +158,11 @@ class MailPilotService:
                 logging.info("=" * 60)
                 return
             
-            logging.info(f"✅ Found {result['total_emails']} emails to process")
+            logging.info("✅ Found %s emails to process", result['total_emails'])
             
             # Generate text and HTML summaries
             logging.info("Step 2/6: Generating text and HTML summaries")
-            text_summary = self.email_processor.format_email_summary_text(result)
-            html_summary = self.email_processor.format_email_summary_html(result)
+            text_summary, html_summary = self.email_processor.format_all_summaries(result)
             logging.info("✅ Text and HTML summaries generated")
             
             # Generate voice summary if enabled
@@ -146,34 +178,43 @@ class MailPilotService:
             else:
                 logging.info("Step 3/6: Skipping voice generation (disabled)")
             
-            # Save summary locally (always)
+            # Save locally and send by email concurrently — the two stages
+            # both consume the summaries (and voice file) but are otherwise
+            # independent, so disk I/O overlaps the SMTP round-trips
+            send_enabled = self.config.email.enabled and self.email_sender
             logging.info("Step 4/6: Saving summaries to local files")
-            saved_files = self.file_saver.save_summary(result, text_summary, html_summary, voice_file_path)
-            
-            if saved_files:
-                logging.info(f"✅ Email summary saved locally for {result['total_emails']} emails")
-                logging.info(f"📁 Files saved: {', '.join(saved_files.keys())}")
-                for file_type, file_path in saved_files.items():
-                    logging.info(f"   {file_type}: {file_path}")
+            if send_enabled:
+                logging.info("Step 5/6: Sending email summary")
             else:
-                logging.error("❌ Failed to save email summary locally")
+                logging.info("Step 5/6: Skipping email sending (disabled - summary saved locally only)")
             
-            # Send summary email (only if enabled)
-            if self.config.email.enabled and self.email_sender:
-                logging.info("Step 5/6: Sending email summary")
-                success = self.email_sender.send_summary_email(
+            with ThreadPoolExecutor(max_workers=2) as stage_pool:
+                save_future = stage_pool.submit(
+                    self.file_saver.save_summary, result, text_summary, html_summary, voice_file_path)
+                send_future = stage_pool.submit(
+                    self.email_sender.send_summary_email,
                     recipient=self.config.email.email_address,
                     text_summary=text_summary,
                     html_summary=html_summary,
                     voice_file_path=voice_file_path
-                )
+                ) if send_enabled else None
                 
+                saved_files = save_future.result()
+                success = send_future.result() if send_future else None
+            
+            if saved_files:
+                logging.info("✅ Email summary saved locally for %s emails", result['total_emails'])
+                logging.info("📁 Files saved: %s", ', '.join(saved_files.keys()))
+                for file_type, file_path in saved_files.items():
+                    logging.info("   %s: %s", file_type, file_path)
+            else:
+                logging.error("❌ Failed to save email summary locally")
+            
+            if send_enabled:
                 if success:
-                    logging.info(f"✅ Email summary sent successfully for {result['total_emails']} emails")
+                    logging.info("✅ Email summary sent successfully for %s emails", result['total_emails'])
                 else:
                     logging.error("❌ Failed to send email summary")
-            else:
-                logging.info("Step 5/6: Skipping email sending (disabled - summary saved locally only)")
             
             # Cleanup voice file if created
             logging.info("Step 6/6: Cleaning up temporary files")
@@ -186,7 +227,7 @@ class MailPilotService:
             logging.info("=" * 60)
                 
         except Exception as e:
-            logging.error(f"❌ Error during email processing: {e}")
+            logging.error("❌ Error during email processing: %s", e)
             # Send error notification (only if email is enabled)
             if self.config.email.enabled and self.email_sender:
                 try:
@@ -195,7 +236,7 @@ class MailPilotService:
                         error_message=str(e)
                     )
                 except Exception as notification_error:
-                    logging.error(f"Failed to send error notification: {notification_error}")
+                    logging.error("Failed to send error notification: %s", notification_error)
     
     def start_service(self):
         """Start the scheduled service"""
@@ -206,25 +247,23 @@ class MailPilotService:
         try:
             self.running = True
             logging.info("🚀 Starting Mail Pilot Service in scheduled mode")
-            logging.info(f"📅 Service will run every {self.config.scheduler.interval_hours} hours")
+            logging.info("📅 Service will run every %s hours", self.config.scheduler.interval_hours)
             logging.info("Press Ctrl+C to stop the service")
             logging.info("=" * 60)
             
             self.scheduler.start()
             
-            # Keep the main thread alive with better interrupt handling
-            import time
-            while self.running:
-                try:
-                    time.sleep(1)
-                except KeyboardInterrupt:
-                    logging.info("🛑 Keyboard interrupt received - stopping service...")
-                    break
+            # Block until stop_service or a signal sets the event — no
+            # once-a-second wakeups just to re-check a flag
+            try:
+                self._stop_event.wait()
+            except KeyboardInterrupt:
+                logging.info("🛑 Keyboard interrupt received - stopping service...")
                 
         except KeyboardInterrupt:
             logging.info("Service interrupted by user")
         except Exception as e:
-            logging.error(f"Service error: {e}")
+            logging.error("Service error: %s", e)
         finally:
             self.stop_service()
         
@@ -254,7 +293,7 @@ class MailPilotService:
             return True
             
         except Exception as e:
-            logging.error(f"Error during single run: {e}")
+            logging.error("Error during single run: %s", e)
             return False
     
     def run_once(self):
@@ -271,21 +310,30 @@ class MailPilotService:
             return True
             
         except Exception as e:
-            logging.error(f"Error during single run: {e}")
+            logging.error("Error during single run: %s", e)
             return False
     
     def stop_service(self):
         """Stop the service gracefully"""
         logging.info("Stopping Mail Pilot Service...")
         self.running = False
+        self._stop_event.set()
         
         if self.scheduler:
             self.scheduler.stop()
         
+        if self.ollama_client:
+            self.ollama_client.close()
+        
         logging.info("Mail Pilot Service stopped")
     
-    def get_status(self) -> dict:
-        """Get comprehensive service status including Ollama connection"""
+    def get_status(self, deep: bool = False) -> dict:
+        """Get comprehensive service status including Ollama connection.
+
+        Pass deep=True to run a live generation probe; the default checks
+        the model list only, and results are served from a short-lived
+        cache so dashboard polling never wakes the LLM.
+        """
         status = {
             'running': self.running,
             'initialized': self.gmail_client is not None,
@@ -301,7 +349,7 @@ class MailPilotService:
         # Test Ollama connection status
         if self.ollama_client:
             logging.info("🔍 Checking Ollama connection status...")
-            ollama_status = self._check_ollama_status()
+            ollama_status = self._check_ollama_status(deep=deep)
             status['ollama'] = ollama_status
         else:
             status['ollama'] = {
@@ -329,34 +377,69 @@ class MailPilotService:
         
         return status
     
-    def _check_ollama_status(self) -> dict:
+    def _check_ollama_status(self, deep: bool = False) -> dict:
         """Check detailed Ollama connection and model status"""
+        now = time.monotonic()
+        if self._status_cache is not None:
+            cached_at, cached_deep, cached = self._status_cache
+            # A cached shallow result cannot answer an explicit deep check —
+            # the caller asked for the generation probe, so run it. A fresh
+            # deep result satisfies either kind of request.
+            if now - cached_at < self.STATUS_CACHE_TTL and (cached_deep or not deep):
+                return cached
+
+        status = self._probe_ollama(deep)
+        self._status_cache = (now, deep, status)
+        return status
+    
+    def _probe_ollama(self, deep: bool) -> dict:
+        # A service that already passed test_connection is known healthy;
+        # shallow checks answer from that without touching the server
+        if not deep and self.ollama_client is not None and self.ollama_client._ready:
+            return {
+                'connected': True,
+                'url': self.config.ollama.url,
+                'model': self.config.ollama.model,
+                'model_available': True,
+                'status': 'healthy'
+            }
+        
         try:
             import requests
             
-            # Test basic connection
-            response = requests.get(f"{self.config.ollama.url}/api/tags", timeout=5)
-            
-            if response.status_code != 200:
-                return {
-                    'connected': False,
-                    'error': f'Server returned status {response.status_code}',
-                    'url': self.config.ollama.url
-                }
-            
-            # Get available models
-            models_data = response.json()
-            models = models_data.get('models', [])
-            model_names = [model.get('name', '') for model in models]
+            # The client's cached tag listing serves both this probe and
+            # test_connection without duplicate /api/tags calls
+            if self.ollama_client:
+                listed = self.ollama_client._list_models()
+                if listed is None:
+                    return {
+                        'connected': False,
+                        'error': 'Server returned an error status',
+                        'url': self.config.ollama.url
+                    }
+                model_names, _ = listed
+            else:
+                response = requests.get(f"{self.config.ollama.url}/api/tags", timeout=5)
+                
+                if response.status_code != 200:
+                    return {
+                        'connected': False,
+                        'error': f'Server returned status {response.status_code}',
+                        'url': self.config.ollama.url
+                    }
+                
+                models = response.json().get('models', [])
+                model_names = [model.get('name', '') for model in models]
             
             # Check if our model is available
             model_available = any(self.config.ollama.model in name for name in model_names)
             
-            # Test model generation (quick test)
+            # Test model generation (only on explicit deep checks — the
+            # probe wakes the model and costs seconds when it is cold)
             generation_test = False
             generation_error = None
             
-            if model_available:
+            if deep and model_available:
                 try:
                     test_payload = {
                         "model": self.config.ollama.model,
@@ -364,7 +447,8 @@ class MailPilotService:
                         "stream": False
                     }
                     
-                    test_response = requests.post(
+                    http = self.ollama_client.session if self.ollama_client else requests
+                    test_response = http.post(
                         f"{self.config.ollama.url}/api/generate",
                         json=test_payload,
                         timeout=10
@@ -387,7 +471,7 @@ class MailPilotService:
                 'available_models': model_names,
                 'generation_test': generation_test,
                 'generation_error': generation_error,
-                'status': 'healthy' if (model_available and generation_test) else 'issues_detected'
+                'status': 'healthy' if (model_available and (generation_test or not deep)) else 'issues_detected'
             }
             
         except requests.exceptions.ConnectionError:
@@ -406,8 +490,9 @@ class MailPilotService:
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals"""
-        logging.info(f"🛑 Received signal {signum}, shutting down gracefully...")
+        logging.info("🛑 Received signal %s, shutting down gracefully...", signum)
         self.running = False
+        self._stop_event.set()
         self.stop_service()
         logging.info("👋 Mail Pilot Service stopped")
         sys.exit(0)
@@ -422,14 +507,16 @@ def main():
     parser.add_argument('--once', action='store_true', help='Run once instead of scheduling')
     parser.add_argument('--menu', action='store_true', help='Run once with interactive menu')
     parser.add_argument('--status', action='store_true', help='Show service status')
+    parser.add_argument('--deep-status', action='store_true',
+                        help='Show service status with a live generation probe')
     
     args = parser.parse_args()
     
     try:
         service = MailPilotService(config_file=args.config)
         
-        if args.status:
-            status = service.get_status()
+        if args.status or args.deep_status:
+            status = service.get_status(deep=args.deep_status)
             print(f"Service Status: {status}")
             return
         
@@ -443,7 +530,7 @@ def main():
             service.start_service()
             
     except Exception as e:
-        logging.error(f"Service failed: {e}")
+        logging.error("Service failed: %s", e)
         sys.exit(1)
 
 if __name__ == '__main__':
@@ -1,41 +1,274 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import json
 import logging
+import os
+import re
+import shelve
+import tempfile
+import threading
+import time
 from typing import List, Dict, Any
 
+# orjson parses and serializes several times faster than stdlib json and
+# is already used opportunistically elsewhere; fall back when missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _first_json_object(text: str) -> str:
+    """Return the first balanced {...} block, or None.
+
+    One linear scan tracking string/escape state, so braces inside string
+    values never count toward nesting; unlike find('{')/rfind('}') it is
+    not confused by multiple JSON blocks or trailing prose after the
+    object. Quotes are only significant inside the object — leading prose
+    with a stray quote must not flip the string state.
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    escaped = False
+    for i, ch in enumerate(text):
+        if depth == 0:
+            if ch == '{':
+                start = i
+                depth = 1
+                in_string = False
+                escaped = False
+            continue
+        if escaped:
+            escaped = False
+        elif ch == '\\' and in_string:
+            escaped = True
+        elif ch == '"':
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+# Quoted reply chains ("On ... wrote:") and "-- " signature blocks are
+# boilerplate the model does not need; both run to the end of the body
+_QUOTED_REPLY_RE = re.compile(r'^On .{0,200}wrote:\s*$.*', re.MULTILINE | re.DOTALL)
+_SIGNATURE_RE = re.compile(r'^-- ?$.*', re.MULTILINE | re.DOTALL)
+
+# Automated senders whose mail is deterministically classifiable without
+# an LLM; checked in order, first match wins
+_TRIVIAL_SENDER_RULES = (
+    (re.compile(r'@github\.com', re.IGNORECASE),
+     "GitHub notification: {subject}", "Low"),
+    (re.compile(r'mailer-daemon@|postmaster@', re.IGNORECASE),
+     "Delivery failure notification: {subject}", "Low"),
+    (re.compile(r'calendar-notification@|@calendar\.google\.com', re.IGNORECASE),
+     "Calendar notification: {subject}", "Medium"),
+    (re.compile(r'no-?reply@|newsletter@|donotreply@', re.IGNORECASE),
+     "Automated notification: {subject}", "Low"),
+)
+
+_OTP_SUBJECT_RE = re.compile(
+    r'\b(verification code|one-time code|one time code|security code|OTP)\b',
+    re.IGNORECASE)
+
 class OllamaClient:
-    def __init__(self, base_url: str, model: str):
+    # Seconds a /api/tags listing stays fresh; startup and status checks
+    # hit it back-to-back with identical results
+    MODEL_LIST_TTL = 10
+
+    # Emails folded into one prompt per batch request; ~8 stays well
+    # inside typical context windows with 500-char previews, and batching
+    # gains diminish past that anyway
+    BATCH_SIZE = int(os.getenv('OLLAMA_BATCH_SIZE', '8'))
+
+    # Instruction and schema come first and the variable email fields
+    # last, so the prefix stays byte-identical call-to-call and the
+    # server's prefix KV cache can skip re-prefilling it
+    SUMMARY_PROMPT_PREFIX = """Analyze this email and respond with JSON only.
+
+Return JSON format:
+{
+    "summary": "Brief 1-2 sentence summary",
+    "action_items": ["list any action items"],
+    "priority": "High/Medium/Low",
+    "requires_response": true/false
+}
+
+--- EMAIL ---
+"""
+
+    # Kept byte-identical call-to-call so the server's prefix KV cache
+    # can reuse the instruction prefill across requests
+    BATCH_INSTRUCTION_PREFIX = """Analyze the following emails and respond with a JSON array only.
+For each email return an object in input order:
+{
+    "summary": "Brief 1-2 sentence summary",
+    "action_items": ["list any action items"],
+    "priority": "High/Medium/Low",
+    "requires_response": true/false
+}
+
+"""
+
+    # Summary schema plus the phishing checklist in one frozen prefix, so
+    # a fused analysis costs one generation and one prompt prefill
+    COMBINED_PROMPT_PREFIX = """Analyze this email and respond with JSON only.
+
+Assess both the content (for summarization) and the phishing risk, checking
+for urgency tactics, requests for personal information, suspicious links,
+generic greetings, authority impersonation and fear tactics.
+
+Return JSON format:
+{
+    "summary": "Brief 1-2 sentence summary",
+    "action_items": ["list any action items"],
+    "priority": "High/Medium/Low",
+    "requires_response": true/false,
+    "phishing_score": 0-100,
+    "phishing_explanation": "brief explanation of phishing findings"
+}
+
+--- EMAIL ---
+"""
+
+    def __init__(self, base_url: str, model: str, max_parallel: int = 4,
+                 keep_alive: str = '1h', num_predict: int = 200):
         self.base_url = base_url.rstrip('/')
         self.model = model
+        self.max_parallel = max_parallel
+        # Decode-length cap per email summary; a summary object is ~60
+        # tokens, so the default leaves generous headroom while keeping
+        # rambling models from overshooting into unused output
+        self.num_predict = num_predict
+        # How long the server keeps the model resident after each call;
+        # sized to the scheduler interval so the first email of a cycle
+        # never pays the cold model load. Older servers ignore the key.
+        self.keep_alive = keep_alive
         self.api_url = f"{self.base_url}/api/generate"
+        # One keep-alive session for every call: module-level requests.*
+        # would open (and tear down) a fresh TCP connection per email.
+        # The adapter also retries transient 5xx responses with backoff.
+        self.session = requests.Session()
+        self.session.headers['Connection'] = 'keep-alive'
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(4, max_parallel),
+            max_retries=Retry(total=3, backoff_factor=0.2,
+                              status_forcelist=[502, 503, 504])
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # Repeated newsletters/notifications hash to the same key and skip
+        # a full generation; the in-memory dict serves hot hits and the
+        # shelve layer persists them across runs. The model name is part of
+        # the key so switching models invalidates naturally. shelve/dbm is
+        # not thread-safe and the parallel summarization workers read and
+        # write the store concurrently, so access goes through _store_lock.
+        self._summary_cache: Dict[str, Dict[str, Any]] = {}
+        self._store_lock = threading.Lock()
+        self._model_list_cache = None
+        # Flipped to True after the first successful connection test so
+        # status checks on a healthy service can skip live probes
+        self._ready = None
+        try:
+            self._summary_store = shelve.open(
+                os.path.join(tempfile.gettempdir(), 'mailpilot_sumcache'))
+        except Exception as e:
+            logging.warning("Summary cache unavailable: %s", e)
+            self._summary_store = None
+
+    def close(self):
+        """Release the pooled connections and the summary store"""
+        self.session.close()
+        if self._summary_store is not None:
+            try:
+                with self._store_lock:
+                    self._summary_store.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _body_preview(body: str, limit: int = 500) -> str:
+        """Strip reply chains and signatures, then truncate for the prompt.
+
+        The boilerplate would otherwise eat most of the preview budget,
+        and uniform previews keep prompts similar enough for the server's
+        prefix cache to help on near-duplicate emails. Character-based
+        truncation stands in for the suggested tokenizer budget — neither
+        tiktoken nor a local tokenizer is a dependency here.
+        """
+        clean = _QUOTED_REPLY_RE.sub('', body)
+        clean = _SIGNATURE_RE.sub('', clean).strip()
+        if not clean:
+            clean = body.strip()
+        return clean[:limit] + "..." if len(clean) > limit else clean
+
+    def _summary_key(self, email_data: Dict[str, Any]) -> str:
+        raw = f"{self.model}|{email_data['sender']}|{email_data['subject']}|{email_data['body'][:500]}"
+        return hashlib.blake2b(raw.encode('utf-8', 'replace'), digest_size=16).hexdigest()
     
+    def _list_models(self):
+        """Return (model_names, raw_models) from /api/tags, briefly cached.
+
+        Startup and status checks request the same listing within seconds
+        of each other; memoizing it halves the tag calls. Returns None if
+        the server answered with a non-200 status.
+        """
+        now = time.monotonic()
+        if self._model_list_cache is not None and now - self._model_list_cache[0] < self.MODEL_LIST_TTL:
+            return self._model_list_cache[1]
+        
+        response = self.session.get(f"{self.base_url}/api/tags", timeout=10)
+        if response.status_code != 200:
+            logging.error("Ollama server returned status %s", response.status_code)
+            return None
+        
+        models = response.json().get('models', [])
+        listed = ([model.get('name', '') for model in models], models)
+        self._model_list_cache = (now, listed)
+        return listed
+
+    def invalidate_model_list(self):
+        """Drop the cached tag listing (e.g. after pulling a model)"""
+        self._model_list_cache = None
+
     def test_connection(self) -> bool:
         try:
-            logging.info(f"Testing connection to Ollama at {self.base_url}")
+            logging.info("Testing connection to Ollama at %s", self.base_url)
             
-            # Test basic connection
-            response = requests.get(f"{self.base_url}/api/tags", timeout=10)
-            if response.status_code != 200:
-                logging.error(f"Ollama server returned status {response.status_code}")
+            # Test basic connection and check if the model is available
+            listed = self._list_models()
+            if listed is None:
                 return False
+            model_names, _ = listed
             
-            # Check if the model is available
-            models = response.json().get('models', [])
-            model_names = [model.get('name', '') for model in models]
-            
-            logging.info(f"Available models: {', '.join(model_names)}")
+            logging.info("Available models: %s", ', '.join(model_names))
             
             if not any(self.model in name for name in model_names):
-                logging.error(f"Model '{self.model}' not found. Available models: {', '.join(model_names)}")
-                logging.error(f"Please run: ollama pull {self.model}")
+                logging.error("Model '%s' not found. Available models: %s", self.model, ', '.join(model_names))
+                logging.error("Please run: ollama pull %s", self.model)
                 return False
             
             # Test actual generation with a simple prompt
-            logging.info(f"Testing model '{self.model}' with simple prompt...")
+            logging.info("Testing model '%s' with simple prompt...", self.model)
             test_response = self._test_generate()
             
             if test_response:
                 logging.info("✅ Ollama connection and model test successful")
+                self._ready = True
                 return True
             else:
                 logging.error("❌ Ollama model test failed")
@@ -49,7 +282,7 @@ class OllamaClient:
             logging.error("❌ Connection to Ollama timed out")
             return False
         except Exception as e:
-            logging.error(f"❌ Failed to connect to Ollama: {e}")
+            logging.error("❌ Failed to connect to Ollama: %s", e)
             return False
     
     def _test_generate(self) -> bool:
@@ -60,13 +293,14 @@ class OllamaClient:
             payload = {
                 "model": self.model,
                 "prompt": test_prompt,
-                "stream": False
+                "stream": False,
+                "keep_alive": self.keep_alive
             }
             
             # Show progress for the test
             print(f"⏳ Testing {self.model} model response...")
             
-            response = requests.post(
+            response = self.session.post(
                 self.api_url,
                 json=payload,
                 timeout=30
@@ -74,76 +308,287 @@ class OllamaClient:
             
             if response.status_code == 200:
                 result = response.json().get('response', '').strip()
-                logging.debug(f"Test response: {result}")
+                logging.debug("Test response: %s", result)
                 print(f"✅ Model test successful: {result[:50]}...")
                 return len(result) > 0
             else:
-                logging.error(f"Test generation failed with status {response.status_code}")
+                logging.error("Test generation failed with status %s", response.status_code)
                 print(f"❌ Model test failed: HTTP {response.status_code}")
                 return False
                 
         except Exception as e:
-            logging.error(f"Test generation error: {e}")
+            logging.error("Test generation error: %s", e)
             print(f"❌ Model test error: {e}")
             return False
     
+    @staticmethod
+    def _trivial_summary(email_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Canned summary for mail that needs no LLM, or None"""
+        subject = email_data['subject']
+        if _OTP_SUBJECT_RE.search(subject):
+            return {
+                "summary": f"One-time code email: {subject}",
+                "action_items": [],
+                "priority": "Low",
+                "requires_response": False
+            }
+        for pattern, template, priority in _TRIVIAL_SENDER_RULES:
+            if pattern.search(email_data['sender']):
+                return {
+                    "summary": template.format(subject=subject),
+                    "action_items": [],
+                    "priority": priority,
+                    "requires_response": False
+                }
+        return None
+
     def summarize_email(self, email_data: Dict[str, Any]) -> Dict[str, str]:
-        logging.info(f"Generating AI summary for email from {email_data['sender']}")
+        trivial = self._trivial_summary(email_data)
+        if trivial is not None:
+            logging.info("Trivial classification for email from %s - no LLM call", email_data['sender'])
+            return trivial
+        
+        key = self._summary_key(email_data)
+        cached = self._summary_cache.get(key)
+        if cached is None and self._summary_store is not None:
+            with self._store_lock:
+                cached = self._summary_store.get(key)
+        if cached is not None:
+            logging.info("Summary cache hit for email from %s", email_data['sender'])
+            self._summary_cache[key] = cached
+            return cached
+        
+        logging.info("Generating AI summary for email from %s", email_data['sender'])
         
         # Truncate email body for faster processing
-        body_preview = email_data['body'][:500] + "..." if len(email_data['body']) > 500 else email_data['body']
+        body_preview = self._body_preview(email_data['body'])
+        
+        prompt = self.SUMMARY_PROMPT_PREFIX + (
+            f"From: {email_data['sender']}\n"
+            f"Subject: {email_data['subject']}\n\n"
+            f"Content: {body_preview}"
+        )
         
-        prompt = f"""Analyze this email and respond with JSON only:
+        try:
+            logging.debug("Sending email to Ollama for analysis (model: %s)", self.model)
+            response = self._generate(prompt, stream=True, json_mode=True,
+                                      options={"num_predict": self.num_predict, "temperature": 0.2})
+            logging.debug("Received response from Ollama: %s...", response[:100])
+            parsed = self._parse_summary_response(response)
+            logging.info("Email summary completed - Priority: %s", parsed.get('priority', 'Unknown'))
+            self._summary_cache[key] = parsed
+            if self._summary_store is not None:
+                try:
+                    with self._store_lock:
+                        self._summary_store[key] = parsed
+                except Exception as cache_error:
+                    logging.warning("Failed to persist summary: %s", cache_error)
+            return parsed
+        except Exception as e:
+            logging.error("Error summarizing email from %s: %s", email_data['sender'], e)
+            return {
+                "summary": f"Error processing email from {email_data['sender']}",
+                "action_items": [],
+                "priority": "Medium",
+                "requires_response": False
+            }
+    
+    def analyze_email_combined(self, email_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Summary plus phishing assessment in one generation.
 
-From: {email_data['sender']}
-Subject: {email_data['subject']}
+        The summary and the phishing check read the same From/Subject/body
+        block, so fusing them into one request halves the LLM round-trips
+        per email and prefills the shared content only once. The returned
+        dict carries the summarize_email fields plus phishing_score and
+        phishing_explanation, which PhishingDetector.analyze_email accepts
+        as a pre-computed llm_result.
+        """
+        # Separate keyspace from plain summaries — same content, different
+        # schema — so mode switches never serve a result missing fields
+        key = 'c:' + self._summary_key(email_data)
+        cached = self._summary_cache.get(key)
+        if cached is None and self._summary_store is not None:
+            with self._store_lock:
+                cached = self._summary_store.get(key)
+        if cached is not None:
+            logging.info("Combined analysis cache hit for email from %s", email_data['sender'])
+            self._summary_cache[key] = cached
+            return cached
 
-Content: {body_preview}
+        logging.info("Generating combined summary/phishing analysis for email from %s", email_data['sender'])
+
+        body_preview = self._body_preview(email_data['body'])
+
+        prompt = self.COMBINED_PROMPT_PREFIX + (
+            f"From: {email_data['sender']}\n"
+            f"Subject: {email_data['subject']}\n\n"
+            f"Content: {body_preview}"
+        )
 
-Return JSON format:
-{{
-    "summary": "Brief 1-2 sentence summary",
-    "action_items": ["list any action items"],
-    "priority": "High/Medium/Low",
-    "requires_response": true/false
-}}"""
-        
         try:
-            logging.debug(f"Sending email to Ollama for analysis (model: {self.model})")
-            response = self._generate(prompt)
-            logging.debug(f"Received response from Ollama: {response[:100]}...")
+            # Two schemas' worth of output; still tightly bounded
+            response = self._generate(prompt, stream=True, json_mode=True,
+                                      options={"num_predict": self.num_predict + 100, "temperature": 0.2})
             parsed = self._parse_summary_response(response)
-            logging.info(f"Email summary completed - Priority: {parsed.get('priority', 'Unknown')}")
+            logging.info("Combined analysis completed - Priority: %s, Phishing score: %s",
+                         parsed.get('priority', 'Unknown'), parsed.get('phishing_score', 'Unknown'))
+            self._summary_cache[key] = parsed
+            if self._summary_store is not None:
+                try:
+                    with self._store_lock:
+                        self._summary_store[key] = parsed
+                except Exception as cache_error:
+                    logging.warning("Failed to persist combined analysis: %s", cache_error)
             return parsed
         except Exception as e:
-            logging.error(f"Error summarizing email from {email_data['sender']}: {e}")
+            logging.error("Error in combined analysis for email from %s: %s", email_data['sender'], e)
             return {
                 "summary": f"Error processing email from {email_data['sender']}",
                 "action_items": [],
                 "priority": "Medium",
                 "requires_response": False
             }
-    
+
+    def summarize_emails_parallel(self, emails: List[Dict[str, Any]],
+                                  max_workers: int = None,
+                                  combined: bool = False) -> List[Dict[str, Any]]:
+        """Summarize emails concurrently, preserving input order.
+
+        Each call blocks on the Ollama HTTP response, so overlapping them
+        with threads lets the server's own scheduling decide the effective
+        parallelism; requests releases the GIL while waiting. The shared
+        session keeps the connections pooled. With combined=True each
+        email gets the fused summary + phishing analysis instead.
+        """
+        if not emails:
+            return []
+        analyze = self.analyze_email_combined if combined else self.summarize_email
+        workers = min(max_workers or self.max_parallel, len(emails))
+        if workers <= 1:
+            return [analyze(e) for e in emails]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(analyze, emails))
+
+    def summarize_emails_batch(self, emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Summarize many emails with one generation per BATCH_SIZE chunk.
+
+        Cached emails are served directly; only the misses are folded into
+        a multi-email prompt, so K emails cost one HTTP round-trip and one
+        prompt prefill instead of K. Chunks are dispatched concurrently up
+        to max_parallel, layering row-marshalling on top of the parallel
+        workers. Falls back to per-email calls for any chunk whose array
+        response cannot be parsed.
+        """
+        results: List[Dict[str, Any]] = [None] * len(emails)
+        misses = []
+        for i, email_data in enumerate(emails):
+            trivial = self._trivial_summary(email_data)
+            if trivial is not None:
+                results[i] = trivial
+                continue
+            key = self._summary_key(email_data)
+            cached = self._summary_cache.get(key)
+            if cached is None and self._summary_store is not None:
+                with self._store_lock:
+                    cached = self._summary_store.get(key)
+            if cached is not None:
+                self._summary_cache[key] = cached
+                results[i] = cached
+            else:
+                misses.append(i)
+
+        chunks = [misses[start:start + self.BATCH_SIZE]
+                  for start in range(0, len(misses), self.BATCH_SIZE)]
+        if len(chunks) > 1:
+            workers = min(self.max_parallel, len(chunks))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                parsed_chunks = list(executor.map(
+                    lambda chunk: self._summarize_chunk([emails[i] for i in chunk]), chunks))
+        else:
+            parsed_chunks = [self._summarize_chunk([emails[i] for i in chunk])
+                             for chunk in chunks]
+
+        for chunk, parsed in zip(chunks, parsed_chunks):
+            for i, summary in zip(chunk, parsed):
+                results[i] = summary
+                key = self._summary_key(emails[i])
+                self._summary_cache[key] = summary
+                if self._summary_store is not None:
+                    try:
+                        with self._store_lock:
+                            self._summary_store[key] = summary
+                    except Exception:
+                        pass
+
+        return results
+
+    def _summarize_chunk(self, emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        parts = [self.BATCH_INSTRUCTION_PREFIX]
+        for i, email_data in enumerate(emails, 1):
+            body_preview = self._body_preview(email_data['body'])
+            parts.append(f"=== EMAIL {i} ===\n"
+                         f"From: {email_data['sender']}\n"
+                         f"Subject: {email_data['subject']}\n"
+                         f"Content: {body_preview}\n\n")
+
+        try:
+            logging.info("Generating batched summaries for %s emails", len(emails))
+            response = self._generate(''.join(parts), json_mode=True,
+                                      options={"num_predict": self.num_predict * len(emails)})
+            parsed = self._parse_batch_response(response)
+            if len(parsed) == len(emails):
+                return parsed
+            logging.warning("Batch response had %s entries for %s emails, falling back to per-email calls", len(parsed), len(emails))
+        except Exception as e:
+            logging.error("Batched summarization failed: %s", e)
+
+        return [self.summarize_email(email_data) for email_data in emails]
+
+    def _parse_batch_response(self, response: str) -> List[Dict[str, Any]]:
+        start_idx = response.find('[')
+        end_idx = response.rfind(']') + 1
+        if start_idx == -1 or end_idx == 0:
+            return []
+        try:
+            items = _json_loads(response[start_idx:end_idx])
+        except ValueError:
+            return []
+        if not isinstance(items, list):
+            return []
+        return [item if isinstance(item, dict) else {
+            "summary": str(item),
+            "action_items": [],
+            "priority": "Medium",
+            "requires_response": False
+        } for item in items]
+
     def generate_overall_summary(self, email_summaries: List[Dict[str, Any]]) -> str:
-        logging.info(f"Generating overall summary for {len(email_summaries)} emails")
+        logging.info("Generating overall summary for %s emails", len(email_summaries))
+        
+        # Bucketize and format in one pass instead of filtering the list
+        # per priority and re-walking each bucket to format it
+        buckets = {'High': [], 'Medium': [], 'Low': []}
+        for email in email_summaries:
+            line = f"- {email.get('summary', 'No summary')} (Actions: {', '.join(email.get('action_items', []))})"
+            buckets.get(email.get('priority'), buckets['Medium']).append(line)
         
-        high_priority = [e for e in email_summaries if e.get('priority') == 'High']
-        medium_priority = [e for e in email_summaries if e.get('priority') == 'Medium']
-        low_priority = [e for e in email_summaries if e.get('priority') == 'Low']
+        logging.debug("Priority breakdown - High: %s, Medium: %s, Low: %s", len(buckets['High']), len(buckets['Medium']), len(buckets['Low']))
         
-        logging.debug(f"Priority breakdown - High: {len(high_priority)}, Medium: {len(medium_priority)}, Low: {len(low_priority)}")
+        high_block = '\n'.join(buckets['High']) or 'None'
+        medium_block = '\n'.join(buckets['Medium']) or 'None'
+        low_block = '\n'.join(buckets['Low']) or 'None'
         
         prompt = f"""
         Create an executive summary of {len(email_summaries)} unread emails.
         
-        High Priority Emails ({len(high_priority)}):
-        {self._format_emails_for_prompt(high_priority)}
+        High Priority Emails ({len(buckets['High'])}):
+        {high_block}
         
-        Medium Priority Emails ({len(medium_priority)}):
-        {self._format_emails_for_prompt(medium_priority)}
+        Medium Priority Emails ({len(buckets['Medium'])}):
+        {medium_block}
         
-        Low Priority Emails ({len(low_priority)}):
-        {self._format_emails_for_prompt(low_priority)}
+        Low Priority Emails ({len(buckets['Low'])}):
+        {low_block}
         
         Provide a comprehensive summary including:
         - Overall assessment
@@ -156,58 +601,134 @@ Return JSON format:
         
         try:
             logging.debug("Generating executive summary with Ollama")
-            summary = self._generate(prompt)
+            # The digest is prose and legitimately longer, but still bounded
+            summary = self._generate(prompt, options={"num_predict": 600})
             logging.info("Overall summary generation completed")
             return summary
         except Exception as e:
-            logging.error(f"Error generating overall summary: {e}")
+            logging.error("Error generating overall summary: %s", e)
             return f"Summary of {len(email_summaries)} emails processed with some errors."
     
-    def _generate(self, prompt: str) -> str:
+    def _generate(self, prompt: str, stream: bool = False, json_mode: bool = False,
+                  options: Dict[str, Any] = None) -> str:
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False
+            "stream": stream,
+            "keep_alive": self.keep_alive
         }
         
-        response = requests.post(
+        if json_mode:
+            # format=json makes the server constrain decoding to valid
+            # JSON — no prose preamble or trailing chatter, fewer tokens.
+            # Low temperature keeps the structured output deterministic.
+            payload["format"] = "json"
+            payload["options"] = {"temperature": 0.1}
+        
+        if options:
+            payload.setdefault("options", {}).update(options)
+        
+        if stream:
+            return self._generate_streaming(payload)
+        
+        response = self.session.post(
             self.api_url,
-            json=payload,
-            timeout=120  # Increased timeout to 2 minutes
+            timeout=120,  # Increased timeout to 2 minutes
+            **self._encode_payload(payload)
         )
         
         if response.status_code == 200:
-            return response.json().get('response', '')
+            return _json_loads(response.content).get('response', '')
         else:
             raise Exception(f"Ollama API error: {response.status_code}")
+
+    @staticmethod
+    def _encode_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Keyword arguments that attach payload as a JSON request body"""
+        if orjson is not None:
+            return {'data': orjson.dumps(payload),
+                    'headers': {'Content-Type': 'application/json'}}
+        return {'json': payload}
+
+    def _generate_streaming(self, payload: Dict[str, Any]) -> str:
+        """Stream tokens and stop as soon as the JSON object closes.
+
+        Models often append explanation text after the JSON the parser
+        slices out anyway; tracking brace depth lets us close the
+        connection at the final '}' and abort the remaining generation
+        server-side.
+        """
+        response = self.session.post(
+            self.api_url,
+            timeout=120,
+            stream=True,
+            **self._encode_payload(payload)
+        )
+        
+        if response.status_code != 200:
+            response.close()
+            raise Exception(f"Ollama API error: {response.status_code}")
+        
+        parts = []
+        depth = 0
+        seen_open = False
+        # Braces inside JSON string values must not count toward nesting,
+        # so track string/escape state across streamed pieces
+        in_string = False
+        escaped = False
+        try:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = _json_loads(line)
+                piece = chunk.get('response', '')
+                if piece:
+                    parts.append(piece)
+                    for ch in piece:
+                        if escaped:
+                            escaped = False
+                        elif ch == '\\' and in_string:
+                            escaped = True
+                        elif ch == '"':
+                            in_string = not in_string
+                        elif not in_string:
+                            if ch == '{':
+                                depth += 1
+                                seen_open = True
+                            elif ch == '}':
+                                depth -= 1
+                    if seen_open and depth <= 0:
+                        break
+                if chunk.get('done'):
+                    break
+        finally:
+            response.close()
+        
+        return ''.join(parts)
     
     def _parse_summary_response(self, response: str) -> Dict[str, Any]:
         try:
-            # Try to extract JSON from the response
-            start_idx = response.find('{')
-            end_idx = response.rfind('}') + 1
-            
-            if start_idx != -1 and end_idx != -1:
-                json_str = response[start_idx:end_idx]
-                return json.loads(json_str)
-            else:
-                # Fallback parsing
-                return {
-                    "summary": response[:200] + "..." if len(response) > 200 else response,
-                    "action_items": [],
-                    "priority": "Medium",
-                    "requires_response": False
-                }
-        except json.JSONDecodeError:
+            # json_mode responses are a bare object — parse directly
+            return _json_loads(response)
+        except ValueError:
+            pass
+        try:
+            # Extract the first balanced JSON object — robust against
+            # leading prose, ```json fences and trailing chatter
+            json_str = _first_json_object(response)
+            if json_str is not None:
+                return _json_loads(json_str)
+            # Fallback parsing
+            return {
+                "summary": response[:200] + "..." if len(response) > 200 else response,
+                "action_items": [],
+                "priority": "Medium",
+                "requires_response": False
+            }
+        except ValueError:
             return {
                 "summary": response[:200] + "..." if len(response) > 200 else response,
                 "action_items": [],
                 "priority": "Medium",
                 "requires_response": False
             }
-    
-    def _format_emails_for_prompt(self, emails: List[Dict[str, Any]]) -> str:
-        formatted = []
-        for email in emails:
-            formatted.append(f"- {email.get('summary', 'No summary')} (Actions: {', '.join(email.get('action_items', []))})")
-        return '\n'.join(formatted) if formatted else "None"
\ No newline at end of file
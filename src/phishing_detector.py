@@ -1,5 +1,9 @@
+import hashlib
 import re
 import logging
+import os
+import shelve
+import tempfile
 from typing import Dict, List, Any
 from urllib.parse import urlparse
 import json
@@ -37,11 +41,52 @@ class PhishingDetector:
             'congratulations you have won', 'you are a winner',
             'claim your prize', 'free gift', 'no strings attached'
         ]
-    
-    def analyze_email(self, email: Dict[str, Any]) -> Dict[str, Any]:
+
+        # One alternation scan over the text replaces a Python-level loop
+        # of per-keyword substring searches: O(len(text)) instead of
+        # O(keywords * len(text)). IGNORECASE lets the scans run over the
+        # original text, skipping a full lowered copy of the body per email.
+        self._kw_re = re.compile(
+            '|'.join(re.escape(k) for k in self.phishing_keywords), re.IGNORECASE)
+        self._phrase_re = re.compile(
+            '|'.join(re.escape(p) for p in self.suspicious_phrases), re.IGNORECASE)
+        self._urgency_re = re.compile(
+            r'urgent|immediate|asap|expires|deadline', re.IGNORECASE)
+
+        # Compiled once here; _rule_based_analysis runs per email and was
+        # rebuilding every pattern (and looping pattern lists) on each call
+        self._url_re = re.compile(
+            r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+        self._ip_re = re.compile(r'^\d+\.\d+\.\d+\.\d+')
+        self._spoofing_re = re.compile(
+            '|'.join([r'[0-9]', r'[.-]{2,}', r'[a-z][A-Z]', r'[_-]']))
+        self._credential_re = re.compile(
+            '|'.join([r'password', r'login', r'username', r'pin\s*code',
+                      r'social\s*security', r'credit\s*card', r'bank\s*account']),
+            re.IGNORECASE)
+        self._suspicious_tlds = ('.tk', '.ml', '.ga', '.cf', '.click', '.download')
+
+        # Recurring newsletters/notifications hash to the same key across
+        # runs, so re-scans skip both the LLM round-trip and the rule pass.
+        # The model name is part of the key so switching models invalidates.
+        try:
+            self._analysis_store = shelve.open(
+                os.path.join(tempfile.gettempdir(), 'mailpilot_phishcache'))
+        except Exception as e:
+            logging.warning(f"Phishing analysis cache unavailable: {e}")
+            self._analysis_store = None
+
+    def analyze_email(self, email: Dict[str, Any], llm_result: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Comprehensive phishing analysis of an email
-        
+
+        Args:
+            email: Parsed email dict with sender/subject/body
+            llm_result: Optional pre-computed LLM analysis carrying
+                phishing_score/phishing_explanation (e.g. from
+                OllamaClient.analyze_email_combined); when provided the
+                detector skips its own LLM call
+
         Returns:
             Dict with risk_score (0-100), risk_level, indicators, and explanation
         """
@@ -50,12 +95,24 @@ class PhishingDetector:
             sender = email.get('sender', '')
             subject = email.get('subject', '')
             body = email.get('body', '')
-            
+
+            key = self._analysis_key(sender, subject, body)
+            if self._analysis_store is not None:
+                cached = self._analysis_store.get(key)
+                if cached is not None:
+                    logging.info(f"Phishing analysis cache hit for email from {sender}")
+                    return cached
+
             # Rule-based analysis
             rule_based_score, rule_indicators = self._rule_based_analysis(sender, subject, body)
-            
-            # LLM-based analysis
-            llm_score, llm_explanation = self._llm_based_analysis(sender, subject, body)
+
+            # LLM-based analysis (reuse the combined result when available
+            # instead of paying a second LLM round-trip per email)
+            if llm_result is not None and 'phishing_score' in llm_result:
+                llm_score = min(max(int(llm_result.get('phishing_score', 0)), 0), 100)
+                llm_explanation = llm_result.get('phishing_explanation', 'LLM analysis completed')
+            else:
+                llm_score, llm_explanation = self._llm_based_analysis(sender, subject, body)
             
             # Combine scores (60% LLM, 40% rules)
             final_score = int((llm_score * 0.6) + (rule_based_score * 0.4))
@@ -70,7 +127,7 @@ class PhishingDetector:
             else:
                 risk_level = 'safe'
             
-            return {
+            analysis = {
                 'risk_score': final_score,
                 'risk_level': risk_level,
                 'indicators': rule_indicators,
@@ -78,7 +135,13 @@ class PhishingDetector:
                 'rule_based_score': rule_based_score,
                 'llm_score': llm_score
             }
-            
+            if self._analysis_store is not None:
+                try:
+                    self._analysis_store[key] = analysis
+                except Exception as cache_error:
+                    logging.warning(f"Failed to persist phishing analysis: {cache_error}")
+            return analysis
+
         except Exception as e:
             logging.error(f"Phishing analysis failed: {e}")
             return {
@@ -88,6 +151,11 @@ class PhishingDetector:
                 'explanation': f'Failed to analyze: {str(e)}'
             }
     
+    def _analysis_key(self, sender: str, subject: str, body: str) -> str:
+        model = getattr(self.ollama_client, 'model', '')
+        raw = f"{model}|{sender}|{subject}|{body[:500]}"
+        return hashlib.blake2b(raw.encode('utf-8', 'replace'), digest_size=16).hexdigest()
+
     def _rule_based_analysis(self, sender: str, subject: str, body: str) -> tuple:
         """Rule-based phishing detection"""
         score = 0
@@ -103,38 +171,29 @@ class PhishingDetector:
                 indicators.append(f"Suspicious sender domain: {domain}")
             
             # Domain spoofing (common techniques)
-            spoofing_patterns = [
-                r'[0-9]', r'[.-]{2,}', r'[a-z][A-Z]', r'[_-]'
-            ]
-            for pattern in spoofing_patterns:
-                if re.search(pattern, domain.replace('.com', '').replace('.org', '')):
-                    score += 10
-                    indicators.append("Potentially spoofed domain")
-                    break
-        
-        # Check for phishing keywords in subject
-        subject_lower = subject.lower()
-        for keyword in self.phishing_keywords:
-            if keyword in subject_lower:
-                score += 15
-                indicators.append(f"Suspicious subject: '{keyword}'")
-        
-        # Check for suspicious phrases in body
-        body_lower = body.lower()
-        for phrase in self.suspicious_phrases:
-            if phrase in body_lower:
+            if self._spoofing_re.search(domain.replace('.com', '').replace('.org', '')):
                 score += 10
-                indicators.append(f"Suspicious phrase: '{phrase}'")
+                indicators.append("Potentially spoofed domain")
         
-        # Check for urgency indicators
-        urgency_words = ['urgent', 'immediate', 'asap', 'expires', 'deadline']
-        urgency_count = sum(1 for word in urgency_words if word in body_lower)
+        # Check for phishing keywords in subject (each keyword scores once,
+        # matching the old per-keyword substring loop)
+        for keyword in dict.fromkeys(m.lower() for m in self._kw_re.findall(subject)):
+            score += 15
+            indicators.append(f"Suspicious subject: '{keyword}'")
+
+        # Check for suspicious phrases in body
+        for phrase in dict.fromkeys(m.lower() for m in self._phrase_re.findall(body)):
+            score += 10
+            indicators.append(f"Suspicious phrase: '{phrase}'")
+
+        # Check for urgency indicators (distinct words, as before)
+        urgency_count = len({m.lower() for m in self._urgency_re.findall(body)})
         if urgency_count >= 2:
             score += 20
             indicators.append("Multiple urgency indicators")
         
         # Check for suspicious URLs
-        urls = re.findall(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', body)
+        urls = self._url_re.findall(body)
         for url in urls:
             try:
                 parsed = urlparse(url)
@@ -146,13 +205,12 @@ class PhishingDetector:
                     indicators.append(f"Suspicious shortened URL: {domain}")
                 
                 # IP addresses instead of domains
-                if re.match(r'^\d+\.\d+\.\d+\.\d+', domain):
+                if self._ip_re.match(domain):
                     score += 30
                     indicators.append("URL uses IP address instead of domain")
-                
+
                 # Suspicious TLDs
-                suspicious_tlds = ['.tk', '.ml', '.ga', '.cf', '.click', '.download']
-                if any(domain.endswith(tld) for tld in suspicious_tlds):
+                if domain.endswith(self._suspicious_tlds):
                     score += 20
                     indicators.append(f"Suspicious domain extension: {domain}")
                     
@@ -160,15 +218,9 @@ class PhishingDetector:
                 pass
         
         # Check for credential harvesting patterns
-        credential_patterns = [
-            r'password', r'login', r'username', r'pin\s*code',
-            r'social\s*security', r'credit\s*card', r'bank\s*account'
-        ]
-        for pattern in credential_patterns:
-            if re.search(pattern, body_lower):
-                score += 15
-                indicators.append("Requests sensitive information")
-                break
+        if self._credential_re.search(body):
+            score += 15
+            indicators.append("Requests sensitive information")
         
         # Grammar and spelling issues (simplified check)
         if self._has_poor_grammar(subject + ' ' + body):
@@ -244,21 +296,24 @@ Respond with JSON:
         """Call LLM with timeout handling"""
         import requests
         import time
-        
+
         max_attempts = 2
         timeout_base = 30
-        
+
         for attempt in range(max_attempts):
             try:
                 timeout = timeout_base * (attempt + 1)  # 30s, then 60s
-                
+
                 payload = {
                     "model": self.ollama_client.model,
                     "prompt": prompt,
-                    "stream": False
+                    "stream": False,
+                    "keep_alive": self.ollama_client.keep_alive
                 }
-                
-                response = requests.post(
+
+                # Reuse the client's pooled keep-alive session rather than
+                # opening a fresh connection per analysis call
+                response = self.ollama_client.session.post(
                     self.ollama_client.api_url,
                     json=payload,
                     timeout=timeout
@@ -5,6 +5,7 @@ Provides real-time progress updates for email processing
 
 import time
 import threading
+from collections import deque
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import json
@@ -13,7 +14,11 @@ import os
 
 class ProgressTracker:
     """Thread-safe progress tracker for email processing"""
-    
+
+    # Log entries kept; a bounded deque evicts the oldest in O(1) instead
+    # of re-slicing the list on every append past the threshold
+    LOG_MAX_ENTRIES = 100
+
     def __init__(self):
         self._lock = threading.Lock()
         self._state = {
@@ -24,10 +29,10 @@ class ProgressTracker:
             'total_emails': 0,
             'processed_emails': 0,
             'current_email': None,
-            'email_progress': [],  # List of email processing states
+            'email_progress': {},  # email_id -> processing state, insertion-ordered
             'stage': 'idle',  # idle, fetching, categorizing, analyzing, generating_replies, saving, complete
             'stage_progress': 0,
-            'detailed_log': [],  # Detailed processing log
+            'detailed_log': deque(maxlen=self.LOG_MAX_ENTRIES),  # Detailed processing log
             'results': None,
             'error': None,
             'started_at': None,
@@ -45,18 +50,18 @@ class ProgressTracker:
                 'total_emails': total_emails,
                 'processed_emails': 0,
                 'current_email': None,
-                'email_progress': [],
+                'email_progress': {},
                 'stage': 'fetching',
                 'stage_progress': 0,
-                'detailed_log': [],
+                'detailed_log': deque(maxlen=self.LOG_MAX_ENTRIES),
                 'results': None,
                 'error': None,
                 'started_at': datetime.now().isoformat(),
                 'completed_at': None
             })
             
-            self.add_log("Starting email processing session", 'info')
-    
+            self._add_log_locked("Starting email processing session", 'info')
+
     def update_stage(self, stage: str, progress: int, step: str):
         """Update the current processing stage"""
         with self._lock:
@@ -66,8 +71,8 @@ class ProgressTracker:
                 'current_step': step,
                 'progress': self._calculate_overall_progress()
             })
-            
-            self.add_log(f"Stage: {stage} - {step}", 'info')
+
+            self._add_log_locked(f"Stage: {stage} - {step}", 'info')
     
     def update_email_progress(self, email_id: str, subject: str, sender: str, status: str, details: Dict = None):
         """Update progress for individual email"""
@@ -77,20 +82,13 @@ class ProgressTracker:
                 'subject': subject[:50] + '...' if len(subject) > 50 else subject,
                 'sender': sender,
                 'status': status,  # pending, fetching, categorizing, analyzing, generating_reply, completed, error
-                'timestamp': datetime.now().isoformat(),
+                'timestamp_ns': time.time_ns(),
                 'details': details or {}
             }
             
-            # Update existing email or add new one
-            found = False
-            for i, email in enumerate(self._state['email_progress']):
-                if email['email_id'] == email_id:
-                    self._state['email_progress'][i] = email_progress
-                    found = True
-                    break
-            
-            if not found:
-                self._state['email_progress'].append(email_progress)
+            # Update existing email or add new one — O(1) dict assignment
+            # instead of a linear scan per status update
+            self._state['email_progress'][email_id] = email_progress
             
             # Update current email if it's being processed
             if status in ['categorizing', 'analyzing', 'generating_reply']:
@@ -110,16 +108,22 @@ class ProgressTracker:
     def add_log(self, message: str, level: str = 'info'):
         """Add a log entry with timestamp"""
         with self._lock:
-            log_entry = {
-                'timestamp': datetime.now().isoformat(),
-                'message': message,
-                'level': level
-            }
-            self._state['detailed_log'].append(log_entry)
-            
-            # Keep only last 100 log entries
-            if len(self._state['detailed_log']) > 100:
-                self._state['detailed_log'] = self._state['detailed_log'][-100:]
+            self._add_log_locked(message, level)
+
+    def _add_log_locked(self, message: str, level: str):
+        """Append a log entry; the caller must hold self._lock.
+
+        The raw nanosecond timestamp is stored instead of an ISO string:
+        formatting happens once per get_state()/save, not once per event
+        inside the contended critical section.
+        """
+        log_entry = {
+            'timestamp_ns': time.time_ns(),
+            'message': message,
+            'level': level
+        }
+        # maxlen evicts the oldest entry automatically
+        self._state['detailed_log'].append(log_entry)
     
     def complete_processing(self, results: Dict = None):
         """Mark processing as completed"""
@@ -134,8 +138,8 @@ class ProgressTracker:
                 'results': results,
                 'completed_at': datetime.now().isoformat()
             })
-            
-            self.add_log("Email processing completed successfully", 'success')
+
+            self._add_log_locked("Email processing completed successfully", 'success')
     
     def set_error(self, error_message: str):
         """Mark processing as failed with error"""
@@ -148,13 +152,31 @@ class ProgressTracker:
                 'current_step': f'Error: {error_message}',
                 'completed_at': datetime.now().isoformat()
             })
-            
-            self.add_log(f"Processing failed: {error_message}", 'error')
+
+            self._add_log_locked(f"Processing failed: {error_message}", 'error')
     
     def get_state(self) -> Dict:
         """Get current processing state (thread-safe)"""
         with self._lock:
-            return self._state.copy()
+            return self._snapshot()
+
+    @staticmethod
+    def _render_entry(entry: Dict) -> Dict:
+        """Return a copy with the stored nanosecond timestamp as ISO text"""
+        entry = entry.copy()
+        ts_ns = entry.pop('timestamp_ns', None)
+        if ts_ns is not None:
+            entry['timestamp'] = datetime.fromtimestamp(ts_ns / 1e9).isoformat()
+        return entry
+
+    def _snapshot(self) -> Dict:
+        """Serializable copy of the state; the caller must hold self._lock"""
+        state = self._state.copy()
+        # Consumers see the same list shape as before; dict insertion
+        # order preserves the original append order
+        state['email_progress'] = [self._render_entry(e) for e in self._state['email_progress'].values()]
+        state['detailed_log'] = [self._render_entry(e) for e in self._state['detailed_log']]
+        return state
     
     def _calculate_overall_progress(self) -> int:
         """Calculate overall progress based on stage and email count"""
@@ -191,8 +213,10 @@ class ProgressTracker:
         """Save current state to file for persistence"""
         try:
             with self._lock:
-                with open(file_path, 'w') as f:
-                    json.dump(self._state, f, indent=2)
+                state = self._snapshot()
+            # Serialize outside the lock; only the copy needs protection
+            with open(file_path, 'w') as f:
+                json.dump(state, f, indent=2)
         except Exception as e:
             print(f"Failed to save state to file: {e}")
     
@@ -204,6 +228,15 @@ class ProgressTracker:
                     saved_state = json.load(f)
                     with self._lock:
                         self._state.update(saved_state)
+                        # JSON round-trips the log as a plain list and the
+                        # email progress as a list of entries
+                        self._state['detailed_log'] = deque(
+                            self._state['detailed_log'], maxlen=self.LOG_MAX_ENTRIES)
+                        if isinstance(self._state['email_progress'], list):
+                            self._state['email_progress'] = {
+                                e['email_id']: e for e in self._state['email_progress']
+                                if 'email_id' in e
+                            }
                         # Reset running state if loaded from file
                         if self._state['is_running']:
                             self._state['is_running'] = False
@@ -11,6 +11,7 @@ class EmailSummaryScheduler:
         self.running = False
         self.scheduler_thread = None
         self.job_function = None
+        self._job_thread = None
         
     def set_job_function(self, func: Callable):
         """Set the function to be called on schedule"""
@@ -110,7 +111,20 @@ class EmailSummaryScheduler:
         logging.info("Scheduler thread stopped")
     
     def _safe_job_wrapper(self):
-        """Wrapper that safely executes the job function with error handling"""
+        """Run the job on its own worker thread with error handling.
+
+        A processing cycle can take minutes (Gmail + LLM inference), and
+        running it inline would stall schedule.run_pending() and any other
+        scheduled jobs for the whole cycle. Overlapping runs are skipped.
+        """
+        if self._job_thread is not None and self._job_thread.is_alive():
+            logging.warning("Previous email summary job still running, skipping this run")
+            return
+
+        self._job_thread = threading.Thread(target=self._run_job, daemon=True)
+        self._job_thread.start()
+
+    def _run_job(self):
         try:
             logging.info("Starting scheduled email summary job")
             start_time = datetime.now()
@@ -391,7 +391,8 @@ def process_emails_background(timeframe_hours, categorization_method, include_ph
         add_processing_log(f"Starting categorization using method: {categorization_method}", 'info')
         
         # Process emails with enhanced tracking
-        result = process_emails_with_tracking(query, categorization_method, emails)
+        result = process_emails_with_tracking(query, categorization_method, emails,
+                                              include_phishing_detection)
         
         # Stage 3: Phishing analysis (if enabled)
         if include_phishing_detection:
@@ -445,16 +446,19 @@ def process_emails_background(timeframe_hours, categorization_method, include_ph
             'stage': 'error'
         })
 
-def process_emails_with_tracking(query, categorization_method, emails):
+def process_emails_with_tracking(query, categorization_method, emails, include_phishing=False):
     """Process emails following mail_pilot_service pattern with tracking"""
     global demo_processing_state
-    
-    # Build options like mail_pilot_service does
+
+    # Build options like mail_pilot_service does. include_phishing makes
+    # the processor use the fused summary + phishing analysis so the
+    # phishing stage can reuse its LLM fields instead of a second call.
     options = {
         'categorize_emails': True,
         'categorization_method': categorization_method,
         'voice_enabled': False,
-        'detailed_summaries': True
+        'detailed_summaries': True,
+        'include_phishing': include_phishing
     }
     
     add_processing_log(f"Processing {len(emails)} emails with method: {categorization_method}", 'info')
@@ -544,8 +548,13 @@ def add_phishing_analysis_with_tracking(result, emails):
                 )
                 
                 add_processing_log(f"Phishing analysis: {email_summary.get('subject', 'No Subject')[:30]}...", 'info')
-                
-                risk_analysis = phishing_detector.analyze_email(raw_email)
+
+                # Summaries produced by analyze_email_combined already carry
+                # the LLM phishing fields; reuse them instead of a second call
+                risk_analysis = phishing_detector.analyze_email(
+                    raw_email,
+                    llm_result=email_summary if 'phishing_score' in email_summary else None
+                )
                 email_summary.update({
                     'phishing_risk_score': risk_analysis['risk_score'],
                     'phishing_risk_level': risk_analysis['risk_level'],
@@ -674,7 +683,10 @@ def add_phishing_analysis(result, emails):
             # Find corresponding raw email
             raw_email = next((e for e in emails if e['id'] == email_summary['email_id']), None)
             if raw_email:
-                risk_analysis = phishing_detector.analyze_email(raw_email)
+                risk_analysis = phishing_detector.analyze_email(
+                    raw_email,
+                    llm_result=email_summary if 'phishing_score' in email_summary else None
+                )
                 email_summary.update({
                     'phishing_risk_score': risk_analysis['risk_score'],
                     'phishing_risk_level': risk_analysis['risk_level'],
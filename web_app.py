@@ -127,9 +127,8 @@ class WebMailPilotService:
             result = self.email_processor.process_unread_emails()
             
             if result['total_emails'] > 0:
-                # Generate summaries
-                text_summary = self.email_processor.format_email_summary_text(result)
-                html_summary = self.email_processor.format_email_summary_html(result)
+                # Generate summaries (one shared pass builds both reports)
+                text_summary, html_summary = self.email_processor.format_all_summaries(result)
                 
                 # Generate voice if enabled
                 voice_file_path = None